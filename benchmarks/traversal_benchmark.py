@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Traversal benchmark - Measure directory walk scaling from 1 to N threads
+
+Usage:
+    python benchmarks/traversal_benchmark.py /path/to/large/tree --max-workers 16 --repeat 3
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from llm_context_builder.exporters.base_exporter import BaseExporter
+from llm_context_builder.traversal import walk_tree
+
+
+def time_walk(root: str, exporter: BaseExporter, workers: int, repeat: int):
+    """Return (best wall time, files seen, ordered listing) for a worker count"""
+    best = float('inf')
+    listing = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        listing = [
+            (dirpath, files)
+            for dirpath, files in walk_tree(root, exporter._should_exclude_folder, workers)
+        ]
+        best = min(best, time.perf_counter() - start)
+    file_count = sum(len(files) for _, files in listing)
+    return best, file_count, listing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('root', help='Directory tree to walk')
+    parser.add_argument('--max-workers', type=int, default=8, help='Largest worker count to try')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per worker count (best is kept)')
+    args = parser.parse_args()
+
+    root = str(Path(args.root).resolve())
+    exporter = BaseExporter(source_dir=Path(root), output_file=Path('/dev/null'), config={})
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'files':>10}")
+    baseline_time = None
+    baseline_listing = None
+    for workers in worker_counts:
+        elapsed, file_count, listing = time_walk(root, exporter, workers, args.repeat)
+        if baseline_time is None:
+            baseline_time, baseline_listing = elapsed, listing
+        elif listing != baseline_listing:
+            raise SystemExit(f"Order mismatch with {workers} workers")
+        print(f"{workers:>8} {elapsed:>9.3f} {baseline_time / elapsed:>7.2f}x {file_count:>10,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,5 +10,6 @@ __description__ = "Export any project to a single text file optimized for LLM co
 from .main import cli
 from .project_detector import ProjectDetector
 from .exporters.base_exporter import BaseExporter
+from .search_index import SearchIndex
 
-__all__ = ['cli', 'ProjectDetector', 'BaseExporter']
\ No newline at end of file
+__all__ = ['cli', 'ProjectDetector', 'BaseExporter', 'SearchIndex']
\ No newline at end of file
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Cache - Shared location for on-disk caches kept between runs
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+
+def get_cache_dir() -> Path:
+    """Return the per-user cache directory, creating it if needed"""
+    base = os.environ.get('LLM_CONTEXT_CACHE_DIR')
+    if base:
+        cache_dir = Path(base)
+    else:
+        xdg_cache = os.environ.get('XDG_CACHE_HOME')
+        cache_dir = Path(xdg_cache) if xdg_cache else Path.home() / '.cache'
+        cache_dir = cache_dir / 'llm-context-builder'
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def get_project_key(source_dir: Path) -> str:
+    """Stable key identifying a project by its resolved path"""
+    resolved = str(Path(source_dir).resolve())
+    return hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:16]
+
+
+class TokenCache:
+    """Size-bounded LRU cache of token counts keyed by content hash and encoding
+
+    Stored in a single sqlite database in the user cache directory, so identical
+    content is only tokenized once across runs, branches and forks of a project.
+    Lookups read through immediately; new counts and recency updates are buffered
+    and written in one transaction by ``close()``.
+    """
+
+    DEFAULT_MAX_ENTRIES = 500000
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path) if path else get_cache_dir() / 'tokens.sqlite3'
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "  content_hash TEXT NOT NULL,"
+            "  encoding TEXT NOT NULL,"
+            "  tokens INTEGER NOT NULL,"
+            "  last_used INTEGER NOT NULL,"
+            "  PRIMARY KEY (content_hash, encoding)"
+            ");"
+            "CREATE INDEX IF NOT EXISTS tokens_last_used ON tokens (last_used);"
+        )
+        self._new: Dict[Tuple[str, str], int] = {}
+        self._used: Set[Tuple[str, str]] = set()
+
+    def get(self, content_hash: str, encoding: str) -> Optional[int]:
+        """Cached token count, or None on a miss"""
+        key = (content_hash, encoding)
+        if key in self._new:
+            return self._new[key]
+
+        row = self.conn.execute(
+            "SELECT tokens FROM tokens WHERE content_hash = ? AND encoding = ?", key
+        ).fetchone()
+        if row is None:
+            return None
+        self._used.add(key)
+        return row[0]
+
+    def put(self, content_hash: str, encoding: str, tokens: int) -> None:
+        """Record a freshly computed token count"""
+        self._new[(content_hash, encoding)] = tokens
+
+    def close(self) -> None:
+        """Write buffered entries, evict least recently used ones and close the database"""
+        now = time.time_ns()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE tokens SET last_used = ? WHERE content_hash = ? AND encoding = ?",
+                ((now, content_hash, encoding) for content_hash, encoding in self._used)
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tokens (content_hash, encoding, tokens, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                ((content_hash, encoding, tokens, now)
+                 for (content_hash, encoding), tokens in self._new.items())
+            )
+            total = self.conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+            if total > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM tokens WHERE rowid IN "
+                    "(SELECT rowid FROM tokens ORDER BY last_used LIMIT ?)",
+                    (total - self.max_entries,)
+                )
+        self._new.clear()
+        self._used.clear()
+        self.conn.close()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Changes - Detect files added, modified or deleted since a git ref or a previous export
+"""
+
+import hashlib
+import json
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def manifest_path_for(output_file: Path) -> Path:
+    """Sidecar manifest location for an export file"""
+    output_file = Path(output_file)
+    return output_file.with_name(output_file.name + MANIFEST_SUFFIX)
+
+
+def hash_text(content: str) -> str:
+    """Content hash stored in manifests (computed over the text as exported)"""
+    return hashlib.sha1(content.encode('utf-8', errors='surrogateescape')).hexdigest()
+
+
+def load_manifest(path: Path) -> Dict:
+    """Load a manifest, accepting either the manifest itself or the export it belongs to"""
+    path = Path(path)
+    if not path.name.endswith(MANIFEST_SUFFIX):
+        path = manifest_path_for(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Export manifest not found: {path}")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version in {path}: {manifest.get('version')}")
+    return manifest
+
+
+def write_manifest(path: Path, source_dir: Path, files: Dict[str, Dict],
+                   checkpoints: Optional[List] = None, compression: Optional[Dict] = None) -> None:
+    """Write the manifest of exported files (sizes, mtimes and content hashes)
+
+    ``checkpoints`` are the export's running prefix hashes, used to measure how much
+    of the next export is byte-identical at its start. ``compression`` holds the codec,
+    sizes, ratio and throughput of a compressed export.
+    """
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': str(source_dir),
+        'files': dict(sorted(files.items())),
+    }
+    if checkpoints is not None:
+        manifest['checkpoints'] = checkpoints
+    if compression is not None:
+        manifest['compression'] = compression
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+        f.write('\n')
+
+
+def carry_change_counts(files: Dict[str, Dict], previous: Dict[str, Dict]) -> None:
+    """Update each entry's ``changes`` count from the previous manifest, in place
+
+    A file's count grows by one whenever its content hash differs from the previous
+    export, giving a change-frequency history even without version control.
+    """
+    for key, entry in files.items():
+        old = previous.get(key)
+        if old is None:
+            entry['changes'] = 0
+            continue
+        if entry.get('skipped'):
+            # Skipped files are never hashed; size and mtime are all there is to compare
+            changed = (entry.get('size'), entry.get('mtime_ns')) != (old.get('size'), old.get('mtime_ns'))
+        else:
+            changed = entry.get('sha1') is None or entry.get('sha1') != old.get('sha1')
+        entry['changes'] = old.get('changes', 0) + (1 if changed else 0)
+
+
+def run_git(source_dir: Path, args: List[str]) -> str:
+    """Run a git command inside the source directory and return its stdout"""
+    try:
+        completed = subprocess.run(
+            ['git'] + args,
+            cwd=str(source_dir),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+    except FileNotFoundError:
+        raise RuntimeError("git is not installed or not on PATH")
+
+    if completed.returncode != 0:
+        message = completed.stderr.decode('utf-8', errors='replace').strip()
+        raise ValueError(f"git {' '.join(args[:2])} failed: {message}")
+    return completed.stdout.decode('utf-8', errors='surrogateescape')
+
+
+def changes_since_ref(source_dir: Path, ref: str) -> Dict[str, List[Path]]:
+    """Files changed in the working tree relative to a git ref
+
+    Paths are relative to ``source_dir``, which may be a subdirectory of the repository.
+    Untracked (but not ignored) files are reported as added.
+    """
+    source_dir = Path(source_dir)
+    try:
+        run_git(source_dir, ['rev-parse', '--verify', '--quiet', f"{ref}^{{commit}}"])
+    except ValueError:
+        raise ValueError(f"Unknown git ref: {ref}")
+
+    added: List[Path] = []
+    modified: List[Path] = []
+    deleted: List[Path] = []
+
+    output = run_git(
+        source_dir,
+        ['diff', '--name-status', '-z', '--no-renames', '--relative', ref, '--', '.']
+    )
+    fields = output.split('\0')
+    for status, path in zip(fields[0::2], fields[1::2]):
+        if not status:
+            continue
+        relative_path = Path(path)
+        if status.startswith('A'):
+            added.append(relative_path)
+        elif status.startswith('D'):
+            deleted.append(relative_path)
+        else:
+            modified.append(relative_path)
+
+    untracked = run_git(source_dir, ['ls-files', '--others', '--exclude-standard', '-z', '--', '.'])
+    added.extend(Path(path) for path in untracked.split('\0') if path)
+
+    return {
+        'added': sorted(added),
+        'modified': sorted(modified),
+        'deleted': sorted(deleted),
+    }
+
+
+def _read_text_hash(file_path: Path) -> Optional[str]:
+    """Hash a file the same way the exporter does, or None if it cannot be read as text"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return hash_text(f.read())
+    except (UnicodeDecodeError, OSError):
+        return None
+
+
+def changes_since_manifest(source_dir: Path, manifest: Dict,
+                           files: Iterable[Path]) -> Dict[str, List[Path]]:
+    """Files changed relative to a previous export's manifest
+
+    Size and modification time are compared first; a file is only opened (to compare
+    content hashes) when its size is unchanged but its modification time differs. Such
+    files, when their content turns out unchanged, get their new ``mtime_ns`` written
+    into ``manifest`` in place, so a manifest carried over from it does not hash them
+    again next time.
+
+    Files the previous export skipped (binary or too large) are recorded too, so they
+    compare as unchanged while their size and mtime are; a skipped file that is gone
+    was never exported, so it is dropped from ``manifest`` rather than reported deleted.
+    """
+    source_dir = Path(source_dir)
+    previous = manifest.get('files', {})
+
+    added: List[Path] = []
+    modified: List[Path] = []
+    seen = set()
+
+    for file_path in files:
+        relative_path = file_path.relative_to(source_dir)
+        key = relative_path.as_posix()
+        seen.add(key)
+
+        entry = previous.get(key)
+        if entry is None:
+            added.append(relative_path)
+            continue
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            continue
+
+        if stat.st_size != entry.get('size'):
+            modified.append(relative_path)
+        elif stat.st_mtime_ns != entry.get('mtime_ns'):
+            previous_hash = entry.get('sha1')
+            if previous_hash is None or _read_text_hash(file_path) != previous_hash:
+                modified.append(relative_path)
+            else:
+                entry['mtime_ns'] = stat.st_mtime_ns
+
+    deleted = []
+    for key in [key for key in previous if key not in seen]:
+        if previous[key].get('skipped'):
+            del previous[key]
+        else:
+            deleted.append(Path(key))
+
+    return {
+        'added': sorted(added),
+        'modified': sorted(modified),
+        'deleted': sorted(deleted),
+    }
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Estimator - Fast pre-flight size estimate of an export from file metadata
+"""
+
+import codecs
+import heapq
+import random
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .exporters.base_exporter import BaseExporter
+from .tokens import TokenCounter
+
+# Used when no sample of an extension (or at all) could be tokenized
+DEFAULT_BYTES_PER_TOKEN = 4.0
+
+# Only the head of each sampled file is tokenized
+SAMPLE_READ_BYTES = 64 * 1024
+
+
+class ExportEstimator:
+    """Projects export size from stat sizes and per-extension bytes-per-token ratios
+
+    Only a small random sample of files is read; the ratios measured on it are applied
+    to the sizes of every other file, so the cost is dominated by the directory walk.
+    """
+
+    def __init__(self, exporter: BaseExporter, token_counter: TokenCounter,
+                 sample_size: int = 40, seed: Optional[int] = None):
+        self.exporter = exporter
+        self.token_counter = token_counter
+        self.sample_size = sample_size
+        self.random = random.Random(seed)
+
+    @staticmethod
+    def _extension(path: Path) -> str:
+        """Grouping key for ratios: the lowercased suffix, or the name for files without one"""
+        return path.suffix.lower() or path.name
+
+    def _framing(self, file_path: Path, size: int) -> str:
+        """Header and footer the exporter would emit around a file"""
+        relative_path = file_path.relative_to(self.exporter.source_dir)
+        prefix, _, suffix = self.exporter.format.render_file(relative_path, file_path, size, '\n')
+        return prefix + suffix
+
+    def _collect(self) -> Tuple[List[Tuple[Path, int]], List[Tuple[Path, int]], int]:
+        """Walk like the exporter and return (file, size) pairs of whole and oversized files,
+        and the skip count"""
+        max_file_size = self.exporter.config.get('max_file_size', 1000000)
+        files = []
+        oversized = []
+        skipped = 0
+        for file_path in self.exporter.iter_files():
+            try:
+                file_size = file_path.stat().st_size
+            except OSError:
+                skipped += 1
+                continue
+            # Mirror the exporter: very large files are dropped, large ones replaced by
+            # a one-line notice
+            if file_size > max_file_size * 2:
+                skipped += 1
+            elif file_size > max_file_size:
+                oversized.append((file_path, file_size))
+            else:
+                files.append((file_path, file_size))
+        return files, oversized, skipped + self.exporter.files_excluded
+
+    def _pick_sample(self, by_extension: Dict[str, List[Tuple[Path, int]]],
+                     total_bytes: int) -> List[Tuple[str, Path]]:
+        """Choose sample files, allocating more of the budget to extensions with more bytes"""
+        extension_bytes = sorted(
+            ((sum(size for _, size in files), ext) for ext, files in by_extension.items()),
+            reverse=True
+        )
+        sample = []
+        budget = self.sample_size
+        for ext_bytes, ext in extension_bytes:
+            if budget <= 0:
+                break
+            share = max(1, round(self.sample_size * ext_bytes / max(total_bytes, 1)))
+            candidates = [path for path, size in by_extension[ext] if size > 0]
+            count = min(share, budget, len(candidates))
+            sample.extend((ext, path) for path in self.random.sample(candidates, count))
+            budget -= count
+        return sample
+
+    def _calibrate(self, sample: List[Tuple[str, Path]]) -> Tuple[Dict[str, float], float, int]:
+        """Tokenize the sample and return per-extension and overall bytes-per-token ratios"""
+        sampled_bytes: Dict[str, int] = defaultdict(int)
+        sampled_tokens: Dict[str, int] = defaultdict(int)
+        files_read = 0
+
+        for ext, file_path in sample:
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read(SAMPLE_READ_BYTES)
+                # The cut may split a multibyte character; an incremental decoder holds
+                # the incomplete tail back instead of failing on it
+                decoder = codecs.getincrementaldecoder('utf-8')()
+                text = decoder.decode(data, final=False)
+            except (UnicodeDecodeError, OSError):
+                continue  # Binary files are skipped by the export as well
+            consumed = len(data) - len(decoder.getstate()[0])
+            tokens = self.token_counter.count(text)
+            if tokens:
+                sampled_bytes[ext] += consumed
+                sampled_tokens[ext] += tokens
+                files_read += 1
+
+        ratios = {ext: sampled_bytes[ext] / sampled_tokens[ext] for ext in sampled_tokens}
+        total_tokens = sum(sampled_tokens.values())
+        overall = sum(sampled_bytes.values()) / total_tokens if total_tokens else DEFAULT_BYTES_PER_TOKEN
+        return ratios, overall, files_read
+
+    def estimate(self, top_n: int = 10) -> Dict:
+        """Project file count, bytes and tokens for the export without reading it"""
+        files, oversized, skipped = self._collect()
+        max_file_size = self.exporter.config.get('max_file_size', 1000000)
+
+        by_extension: Dict[str, List[Tuple[Path, int]]] = defaultdict(list)
+        for file_path, size in files:
+            by_extension[self._extension(file_path)].append((file_path, size))
+        total_bytes = sum(size for _, size in files)
+
+        ratios, overall_ratio, files_sampled = self._calibrate(
+            self._pick_sample(by_extension, total_bytes)
+        )
+
+        extension_tokens: Dict[str, int] = {}
+        file_tokens = []
+        content_tokens = 0
+        for ext, ext_files in by_extension.items():
+            ratio = ratios.get(ext, overall_ratio)
+            ext_total = 0
+            for file_path, size in ext_files:
+                tokens = int(size / ratio)
+                ext_total += tokens
+                file_tokens.append((tokens, file_path))
+            extension_tokens[ext] = ext_total
+            content_tokens += ext_total
+
+        # Oversized files only contribute the exporter's notice, which is short enough to count
+        for file_path, size in oversized:
+            notice = self.exporter._too_large_notice(size, max_file_size)
+            tokens = self.token_counter.count(notice)
+            ext = self._extension(file_path)
+            extension_tokens[ext] = extension_tokens.get(ext, 0) + tokens
+            file_tokens.append((tokens, file_path))
+            content_tokens += tokens
+            total_bytes += len(notice)
+        files += oversized
+
+        # Per-file headers and footers are rendered (cheaply) and converted with the
+        # ratio measured on the first one
+        framing_lengths = [len(self._framing(file_path, size)) for file_path, size in files]
+        framing_tokens = self.token_counter.count(self.exporter._create_header())
+        if files:
+            first_framing = self._framing(*files[0])
+            framing_ratio = len(first_framing) / max(self.token_counter.count(first_framing), 1)
+            framing_tokens += int(sum(framing_lengths) / framing_ratio)
+
+        largest_files = [
+            (path.relative_to(self.exporter.source_dir), tokens)
+            for tokens, path in heapq.nlargest(top_n, file_tokens, key=lambda item: item[0])
+        ]
+        largest_extensions = heapq.nlargest(top_n, extension_tokens.items(), key=lambda item: item[1])
+
+        return {
+            'files': len(files),
+            'files_skipped': skipped,
+            'bytes': total_bytes,
+            'tokens': content_tokens + framing_tokens,
+            'framing_tokens': framing_tokens,
+            'files_sampled': files_sampled,
+            'exact_sample': self.token_counter.is_exact,
+            'largest_files': largest_files,
+            'largest_extensions': largest_extensions,
+        }
@@ -2,6 +2,11 @@
 Exporters package for LLM Context Builder
 """
 
-from .base_exporter import BaseExporter
+from .base_exporter import BaseExporter, ExportSession
+from .formats import FORMATS, ExportFormat, get_format, register_format
+from .multi_exporter import MultiExporter
 
-__all__ = ['BaseExporter']
\ No newline at end of file
+__all__ = [
+    'BaseExporter', 'ExportSession', 'MultiExporter',
+    'ExportFormat', 'FORMATS', 'get_format', 'register_format'
+]
\ No newline at end of file
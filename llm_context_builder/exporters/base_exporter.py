@@ -3,20 +3,222 @@
 Base Exporter - Core file combining logic optimized for LLM context
 """
 
+import codecs
+import io
 import os
+import re
+import hashlib
+import sys
 import fnmatch
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, TextIO, Tuple
+
+from ..changes import hash_text, manifest_path_for
+from ..sources import InputSource, SourceEntry
+from ..traversal import walk_tree
+from ..tokens import TokenCounter
+from .compression import CompressedWriter
+from .formats import get_format
+
+# Output path meaning "write the export to standard output"
+STDOUT_MARKER = '-'
+
+# Framing text is tokenized in batches of about this many characters, so memory stays
+# flat while counts stay close to tokenizing all framing at once
+FRAMING_BATCH_CHARS = 64 * 1024
+
+
+class ExportSession:
+    """One export in progress: its open destination and running totals
+    
+    ``BaseExporter.export`` drives a single session from its own walk; a
+    ``MultiExporter`` drives one session per target from a shared walk.
+    """
+    
+    def __init__(self, exporter: 'BaseExporter', keep_content: bool = True):
+        self.exporter = exporter
+        self.format = exporter.format
+        self.token_counter = exporter.token_counter
+        self.max_file_size = exporter.config.get('max_file_size', 1000000)
+        self.reproducible = exporter.config.get('reproducible', False)
+        
+        self.files_processed = 0
+        self.files_skipped = 0
+        self.total_size = 0
+        self.manifest: Dict[str, Dict] = {}
+        self.collected: Optional[List[str]] = [] if keep_content else None
+        self.content_tokens = 0
+        self.framing: List[str] = []
+        self.framing_chars = 0
+        self.framing_tokens = 0
+        
+        # Running hashes of the output at each section boundary, for prefix comparison
+        self.prefix_hash = hashlib.sha1()
+        self.offset = 0
+        self.checkpoints: List[List] = []
+        
+        self.out = exporter._open_output()
+        self.closed = False
+    
+    def write(self, part: str, is_framing: bool = True) -> None:
+        """Write one piece of the export, keeping hashes and framing totals current"""
+        self.out.write(part)
+        if self.reproducible:
+            encoded = part.encode('utf-8', errors='surrogateescape')
+            self.prefix_hash.update(encoded)
+            self.offset += len(encoded)
+        if self.collected is not None:
+            self.collected.append(part)
+        if is_framing and self.token_counter is not None:
+            self.framing.append(part)
+            self.framing_chars += len(part)
+            if self.framing_chars >= FRAMING_BATCH_CHARS:
+                self._count_framing()
+    
+    def _count_framing(self) -> None:
+        """Tokenize the buffered framing text and release it"""
+        if self.framing:
+            self.framing_tokens += self.token_counter.count(''.join(self.framing))
+            self.framing = []
+            self.framing_chars = 0
+    
+    def begin(self) -> None:
+        """Write the document header"""
+        self.write(self.exporter._create_header())
+        self.checkpoints.append([self.offset, self.prefix_hash.hexdigest()])
+    
+    def add_file(self, relative_path: Path, file_path: Path, file_size: int, mtime_ns: int,
+                 content: str, content_hash: Optional[str] = None) -> None:
+        """Write one file's section and record it in the manifest"""
+        content_hash = content_hash or hash_text(content)
+        # Absolute paths differ between checkouts, so reproducible output omits them
+        prefix, body, suffix = self.format.render_file(
+            relative_path, relative_path if self.reproducible else file_path,
+            file_size, content
+        )
+        
+        # File contents are counted individually so unchanged files hit the cache
+        if self.token_counter is not None:
+            content_tokens = self.token_counter.count_cached(content, content_hash)
+            self.content_tokens += content_tokens
+            # Escaping the format applies to the body (e.g. JSON strings) is format overhead
+            if body != content:
+                self.framing_tokens += self.token_counter.count_cached(body) - content_tokens
+        
+        self.write(prefix)
+        self.write(body, is_framing=False)
+        self.write(suffix)
+        if self.reproducible:
+            self.checkpoints.append([self.offset, self.prefix_hash.hexdigest()])
+        
+        # Hand each section to a streaming reader as soon as it is complete
+        if self.exporter.streams_to_stdout:
+            self.out.flush()
+        
+        self.manifest[relative_path.as_posix()] = {
+            'size': file_size,
+            'mtime_ns': mtime_ns,
+            # Truncated content cannot vouch for the whole file
+            'sha1': content_hash if file_size <= self.max_file_size else None,
+        }
+        
+        self.files_processed += 1
+        self.total_size += min(file_size, self.max_file_size)
+    
+    def skip_file(self, relative_path: Path, file_size: int, mtime_ns: int) -> None:
+        """Count a file left out of the export (binary or far too large)
+        
+        It is still recorded in the manifest, so ``--since-export`` can tell it is
+        unchanged without opening it again.
+        """
+        self.manifest[relative_path.as_posix()] = {
+            'size': file_size,
+            'mtime_ns': mtime_ns,
+            'sha1': None,
+            'skipped': True,
+        }
+        self.files_skipped += 1
+    
+    def add_error(self, relative_path: Path, message: str) -> None:
+        """Write the section for a file that could not be exported"""
+        self.write(self.format.file_error(relative_path, message))
+        self.files_skipped += 1
+    
+    def finish(self, deleted_files: Optional[List[Path]] = None) -> Dict:
+        """Write the trailing sections and return the export result"""
+        exporter = self.exporter
+        self.files_skipped += exporter.files_excluded
+        
+        if deleted_files:
+            self.write(self.format.deleted_files(deleted_files))
+        
+        # Only aliases of files that made it into this export are worth listing
+        aliases = [
+            (alias.relative_to(exporter.source_dir), primary.relative_to(exporter.source_dir))
+            for alias, primary in exporter.file_aliases
+        ]
+        exported = {key for key, entry in self.manifest.items() if not entry.get('skipped')}
+        aliases = [pair for pair in aliases if pair[1].as_posix() in exported]
+        if aliases:
+            self.write(self.format.file_aliases(aliases))
+        
+        # Add summary
+        self.write(exporter._create_summary(self.files_processed, self.files_skipped, self.total_size))
+        
+        # Compression statistics are only final once the stream is finished
+        self.close()
+        compression = None
+        if exporter.compressed_writer is not None:
+            compression = exporter.compressed_writer.stats()
+        
+        tokens = None
+        framing_tokens = None
+        if self.token_counter is not None:
+            self._count_framing()
+            framing_tokens = self.framing_tokens
+            tokens = self.content_tokens + framing_tokens
+        
+        return {
+            'files_processed': self.files_processed,
+            'files_skipped': self.files_skipped,
+            'total_size': self.total_size,
+            'output_file': exporter._output_label(),
+            'content': ''.join(self.collected) if self.collected is not None else None,
+            'manifest': self.manifest,
+            'tokens': tokens,
+            'framing_tokens': framing_tokens,
+            'checkpoints': self.checkpoints if self.reproducible else None,
+            'compression': compression
+        }
+    
+    def close(self) -> None:
+        """Close the destination; a reader that already went away is not an error here"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.exporter._close_output(self.out)
+        except BrokenPipeError:
+            pass
 
 
 class BaseExporter:
     """Exports project files to a single text file optimized for LLM context"""
     
-    def __init__(self, source_dir: Path, output_file: Path, config: Dict):
+    def __init__(self, source_dir: Path, output_file: Path, config: Dict,
+                 token_counter: Optional[TokenCounter] = None,
+                 source: Optional[InputSource] = None):
         self.source_dir = Path(source_dir)
         self.output_file = Path(output_file)
         self.config = config
+        self.token_counter = token_counter
+        # Archive or git commit streamed instead of walking source_dir
+        self.source = source
+        self.format = get_format(config.get('format', 'classic'))
+        
+        # Compressed destination of the current export, if ``compress`` is configured
+        self.compressed_writer: Optional[CompressedWriter] = None
         
         # Default exclusions (merged with config)
         self.default_excluded_extensions = [
@@ -79,40 +281,97 @@ class BaseExporter:
             # This tool's files
             'export_project.py', 'llm_context_builder.py'
         ]
+        
+        # Number of files rejected by the filters during the last walk
+        self.files_excluded = 0
+        
+        # (alias, primary) paths of files reached more than once during the last walk
+        self.file_aliases: List[Tuple[Path, Path]] = []
+        
+        self._compile_filters()
+    
+    @staticmethod
+    def _compile_patterns(patterns: List[str]) -> Optional[Pattern]:
+        """Combine glob patterns into one case-insensitive regex (matched against lowercased names)"""
+        if not patterns:
+            return None
+        return re.compile('|'.join(fnmatch.translate(pattern.lower()) for pattern in patterns))
+    
+    def _compile_filters(self) -> None:
+        """Precompile exclusion rules so per-file checks avoid re-scanning pattern lists"""
+        include_extensions = self.config.get('include_extensions')
+        self._include_extensions = (
+            None if include_extensions is None else {ext.lower() for ext in include_extensions}
+        )
+        self._excluded_extensions = {
+            ext.lower()
+            for ext in self.config.get('exclude_extensions', []) + self.default_excluded_extensions
+        }
+        self._excluded_file_patterns = self.config.get('exclude_files', []) + self.default_excluded_files
+        self._excluded_files_re = self._compile_patterns(self._excluded_file_patterns)
+        self._excluded_folders_re = self._compile_patterns(
+            self.config.get('exclude_folders', []) + self.default_excluded_folders
+        )
     
     def _should_exclude_folder(self, folder_name: str) -> bool:
         """Check if a folder should be excluded"""
-        excluded_folders = self.config.get('exclude_folders', []) + self.default_excluded_folders
-        
-        for pattern in excluded_folders:
-            if fnmatch.fnmatch(folder_name, pattern) or fnmatch.fnmatch(folder_name.lower(), pattern.lower()):
-                return True
-        return False
+        if self._excluded_folders_re is None:
+            return False
+        return self._excluded_folders_re.match(folder_name.lower()) is not None
     
     def _should_exclude_file(self, file_path: Path) -> Tuple[bool, str]:
         """Check if a file should be excluded, return (should_exclude, reason)"""
-        file_name = file_path.name
-        file_ext = file_path.suffix.lower()
+        return self._should_exclude_name(file_path.name)
+    
+    def _should_exclude_name(self, file_name: str) -> Tuple[bool, str]:
+        """``_should_exclude_file`` for a bare file name, so walks need no Path per file"""
+        lowered = file_name.lower()
+        # Same rule as Path.suffix: no suffix for dotfiles or names ending in a dot
+        dot = lowered.rfind('.')
+        file_ext = lowered[dot:] if 0 < dot < len(lowered) - 1 else ''
         
         # Check if we have explicit include extensions
-        include_extensions = self.config.get('include_extensions')
-        if include_extensions is not None:
-            if file_ext not in [ext.lower() for ext in include_extensions]:
+        if self._include_extensions is not None:
+            if file_ext not in self._include_extensions:
                 return True, f"not in include list ({file_ext})"
         
         # Check extension exclusions
-        excluded_extensions = self.config.get('exclude_extensions', []) + self.default_excluded_extensions
-        if file_ext in [ext.lower() for ext in excluded_extensions]:
+        if file_ext in self._excluded_extensions:
             return True, f"excluded extension ({file_ext})"
         
         # Check file pattern exclusions
-        excluded_files = self.config.get('exclude_files', []) + self.default_excluded_files
-        for pattern in excluded_files:
-            if fnmatch.fnmatch(file_name, pattern) or fnmatch.fnmatch(file_name.lower(), pattern.lower()):
-                return True, f"excluded pattern ({pattern})"
+        if self._excluded_files_re is not None and self._excluded_files_re.match(lowered):
+            # Find the pattern responsible only once we know there is a match
+            for pattern in self._excluded_file_patterns:
+                if fnmatch.fnmatch(lowered, pattern.lower()):
+                    return True, f"excluded pattern ({pattern})"
         
         return False, ""
     
+    def _own_output_files(self) -> Dict[str, Path]:
+        """File name -> path of this export's output file and its sidecar manifest"""
+        if self.streams_to_stdout:
+            return {}
+        own_files = (self.output_file, manifest_path_for(self.output_file))
+        return {own_file.name: own_file for own_file in own_files}
+    
+    def is_own_output(self, file_path: Path) -> bool:
+        """Whether a file is this export's output file or its sidecar manifest"""
+        own_file = self._own_output_files().get(file_path.name)
+        try:
+            return own_file is not None and file_path.samefile(own_file)
+        except OSError:
+            return False
+    
+    def is_excluded(self, relative_path: Path) -> bool:
+        """Apply the walk's folder and file filters to a single path relative to the source"""
+        relative_path = Path(relative_path)
+        if self.is_own_output(self.source_dir / relative_path):
+            return True
+        if any(self._should_exclude_folder(part) for part in relative_path.parts[:-1]):
+            return True
+        return self._should_exclude_file(relative_path)[0]
+    
     def _is_text_file(self, file_path: Path) -> bool:
         """Check if a file is likely a text file"""
         try:
@@ -122,20 +381,10 @@ class BaseExporter:
         except (UnicodeDecodeError, PermissionError):
             return False
     
-    def _format_file_header(self, relative_path: Path, file_path: Path) -> str:
-        """Create LLM-optimized file header"""
-        file_size = file_path.stat().st_size
-        return (
-            f"\n{'='*80}\n"
-            f"FILE: {relative_path}\n"
-            f"PATH: {file_path}\n" 
-            f"SIZE: {file_size:,} bytes\n"
-            f"{'='*80}\n"
-        )
-    
-    def _format_file_footer(self, relative_path: Path) -> str:
-        """Create LLM-optimized file footer"""
-        return f"\n{'='*80}\nEND: {relative_path}\n{'='*80}\n"
+    @staticmethod
+    def _too_large_notice(file_size: int, max_size: int) -> str:
+        """Placeholder content for files over the size limit"""
+        return f"[FILE TOO LARGE: {file_size:,} bytes > {max_size:,} bytes limit - showing first {max_size:,} bytes]\n\n"
     
     def _read_file_content(self, file_path: Path, max_size: Optional[int] = None) -> str:
         """Read file content with size limiting"""
@@ -144,7 +393,7 @@ class BaseExporter:
             
             # Check size limit
             if max_size and file_size > max_size:
-                return f"[FILE TOO LARGE: {file_size:,} bytes > {max_size:,} bytes limit - showing first {max_size:,} bytes]\n\n"
+                return self._too_large_notice(file_size, max_size)
             
             with open(file_path, 'r', encoding='utf-8') as f:
                 if max_size:
@@ -163,134 +412,303 @@ class BaseExporter:
         except Exception as e:
             return f"[ERROR reading file: {str(e)}]"
     
-    def export(self) -> Dict:
-        """Export project files to combined text file"""
+    def iter_files(self) -> Iterator[Path]:
+        """Walk the source tree and yield files that pass folder and file filters
+        
+        Files are yielded in sorted top-down order; ``walk_workers`` in the config
+        spreads directory listing over that many threads without changing the order.
+        With ``follow_symlinks``, a physical file reached through several paths is
+        yielded once, at its first path; the others are recorded in ``file_aliases``.
+        """
+        current_root = None
+        for root, _, file, _ in self._walk_files(with_stat=False):
+            if root != current_root:
+                current_root, root_path = root, Path(root)
+            yield root_path / file
+    
+    def iter_file_stats(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Walk like ``iter_files``, yielding (relative POSIX path, stat result) pairs
+        
+        Meant for syncing against stored sizes and mtimes: each file is stat'ed once
+        during the walk and no Path objects are built, which dominates on large trees.
+        Files that cannot be stat'ed are left out.
+        """
+        for _, relative_root, file, file_stat in self._walk_files(with_stat=True):
+            yield relative_root + file, file_stat
+    
+    def _walk_files(self, with_stat: bool) -> Iterator[Tuple[str, str, str, Optional[os.stat_result]]]:
+        """Shared walk yielding (directory, its relative POSIX prefix, file name, stat or None)"""
+        self.files_excluded = 0
+        self.file_aliases = []
+        
+        workers = self.config.get('walk_workers', 1)
+        follow_symlinks = self.config.get('follow_symlinks', False)
+        source = str(self.source_dir)
+        own_files = self._own_output_files()
+        seen_files = {}
+        for root, files in walk_tree(source, self._should_exclude_folder, workers, follow_symlinks):
+            relative_root = os.path.relpath(root, source).replace(os.sep, '/')
+            relative_root = '' if relative_root == '.' else relative_root + '/'
+            for file in files:
+                # Skip output file (and its manifest) if in same tree
+                if file in own_files and self.is_own_output(Path(root) / file):
+                    continue
+                
+                # Check if file should be excluded
+                exclude_file, exclude_reason = self._should_exclude_name(file)
+                if exclude_file:
+                    self.files_excluded += 1
+                    continue
+                
+                file_stat = None
+                if follow_symlinks or with_stat:
+                    try:
+                        file_stat = os.stat(os.path.join(root, file))
+                    except OSError:
+                        continue  # Dangling symlink or file removed during the walk
+                
+                if follow_symlinks:
+                    key = (file_stat.st_dev, file_stat.st_ino)
+                    file_path = Path(root) / file
+                    if key in seen_files:
+                        self.file_aliases.append((file_path, seen_files[key]))
+                        continue
+                    seen_files[key] = file_path
+                
+                yield root, relative_root, file, file_stat
+    
+    @property
+    def streams_to_stdout(self) -> bool:
+        """Whether the export is written to standard output (``-o -``)"""
+        return str(self.output_file) == STDOUT_MARKER
+    
+    def _output_label(self) -> str:
+        """Human-readable name of the export destination"""
+        return '<stdout>' if self.streams_to_stdout else str(self.output_file)
+    
+    def _open_output(self) -> TextIO:
+        """Open the export destination for incremental writing"""
+        codec = self.config.get('compress')
+        if codec:
+            raw = sys.stdout.buffer if self.streams_to_stdout else open(self.output_file, 'wb')
+            self.compressed_writer = CompressedWriter(
+                raw, codec, threaded=self.config.get('compress_thread', False),
+                close_raw=not self.streams_to_stdout
+            )
+            return io.TextIOWrapper(self.compressed_writer, encoding='utf-8')
+        self.compressed_writer = None
+        if self.streams_to_stdout:
+            # Wrap the binary stream so the export is UTF-8 regardless of locale;
+            # writes block when the reader falls behind, which gives natural backpressure
+            return io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+        return open(self.output_file, 'w', encoding='utf-8')
+    
+    def _close_output(self, out: TextIO) -> None:
+        """Close the destination, leaving the process's stdout open"""
+        if self.compressed_writer is not None:
+            # Finishes the compressed stream; stdout itself is left open by the writer
+            out.close()
+        elif self.streams_to_stdout:
+            try:
+                out.flush()
+            finally:
+                out.detach()
+        else:
+            out.close()
+    
+    def export(self, files: Optional[Iterable[Path]] = None,
+               deleted_files: Optional[List[Path]] = None,
+               keep_content: bool = True) -> Dict:
+        """Export project files to combined text file
+        
+        If ``files`` is given (paths relative to the source directory), only those
+        files are exported, in the given order, instead of walking the whole tree.
+        ``deleted_files`` are listed in a compact section after the file contents.
+        
+        Output is written file by file as the walk progresses. With ``keep_content``
+        the combined text is also returned in the result; pass False to keep memory
+        flat on large exports.
+        """
+        if self.source is not None:
+            if files is not None:
+                raise ValueError("Explicit file lists are only supported for directory sources")
+            return self._export_source(deleted_files, keep_content)
+        
         if not self.source_dir.exists():
             raise FileNotFoundError(f"Source directory does not exist: {self.source_dir}")
         
         if not self.source_dir.is_dir():
             raise ValueError(f"Source path is not a directory: {self.source_dir}")
         
-        files_processed = 0
-        files_skipped = 0
-        total_size = 0
         max_file_size = self.config.get('max_file_size', 1000000)  # 1MB default
-        all_content = []
         
-        # Create header
-        header = self._create_header()
-        all_content.append(header)
+        # Explicit file lists keep the exclusion count of the walk that produced them
+        if files is None:
+            file_paths = self.iter_files()
+        else:
+            # Lists built before the export started may name its output (e.g. untracked
+            # files from --since); the output only exists once the session has opened it
+            file_paths = (
+                self.source_dir / relative_path for relative_path in files
+                if not self.is_own_output(self.source_dir / relative_path)
+            )
         
+        session = ExportSession(self, keep_content)
         try:
-            # Walk through all files recursively
-            for root, dirs, files in os.walk(self.source_dir):
-                # Filter out excluded directories in-place
-                dirs[:] = [d for d in dirs if not self._should_exclude_folder(d)]
+            session.begin()
+            
+            for file_path in file_paths:
+                relative_path = file_path.relative_to(self.source_dir)
                 
-                for file in files:
-                    file_path = Path(root) / file
-                    relative_path = file_path.relative_to(self.source_dir)
+                try:
+                    file_stat = file_path.stat()
+                    file_size = file_stat.st_size
                     
-                    # Skip output file if in same tree
-                    try:
-                        if file_path.samefile(self.output_file):
-                            continue
-                    except (OSError, FileNotFoundError):
-                        pass
+                    # Check file size limit
+                    if file_size > max_file_size * 2:  # Skip very large files entirely
+                        session.skip_file(relative_path, file_size, file_stat.st_mtime_ns)
+                        continue
                     
-                    # Check if file should be excluded
-                    exclude_file, exclude_reason = self._should_exclude_file(file_path)
-                    if exclude_file:
-                        files_skipped += 1
+                    # Check if file is readable as text
+                    if not self._is_text_file(file_path):
+                        session.skip_file(relative_path, file_size, file_stat.st_mtime_ns)
                         continue
                     
-                    try:
-                        file_size = file_path.stat().st_size
-                        
-                        # Check file size limit
-                        if file_size > max_file_size * 2:  # Skip very large files entirely
-                            files_skipped += 1
-                            continue
-                        
-                        # Check if file is readable as text
-                        if not self._is_text_file(file_path):
-                            files_skipped += 1
-                            continue
-                        
-                        # Add file to output
-                        all_content.append(self._format_file_header(relative_path, file_path))
-                        content = self._read_file_content(file_path, max_file_size)
-                        all_content.append(content)
-                        
-                        # Ensure content ends with newline
-                        if not content.endswith('\n'):
-                            all_content.append('\n')
-                            
-                        all_content.append(self._format_file_footer(relative_path))
-                        
-                        files_processed += 1
-                        total_size += min(file_size, max_file_size)
-                        
-                    except Exception as e:
-                        # Log error but continue
-                        error_content = (
-                            f"\n{'='*80}\n"
-                            f"FILE: {relative_path}\n"
-                            f"ERROR: {str(e)}\n"
-                            f"{'='*80}\n"
-                        )
-                        all_content.append(error_content)
-                        files_skipped += 1
+                    # Add file to output
+                    content = self._read_file_content(file_path, max_file_size)
+                    session.add_file(relative_path, file_path, file_size, file_stat.st_mtime_ns, content)
+                    
+                except BrokenPipeError:
+                    raise
+                except Exception as e:
+                    # Log error but continue
+                    session.add_error(relative_path, str(e))
             
-            # Add summary
-            summary = self._create_summary(files_processed, files_skipped, total_size)
-            all_content.append(summary)
+            return session.finish(deleted_files)
+            
+        except BrokenPipeError:
+            # The reader went away; let the caller decide how to exit
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Export failed: {e}")
+        finally:
+            session.close()
+    
+    def _skip_entry(self, relative_path: Path) -> bool:
+        """Filter for source entries, counting exclusions like the directory walk does"""
+        # Files in excluded folders are never seen by the walk, so they are not counted
+        if any(self._should_exclude_folder(part) for part in relative_path.parts[:-1]):
+            return True
+        if self._should_exclude_file(relative_path)[0]:
+            self.files_excluded += 1
+            return True
+        return False
+    
+    # Bytes ``_is_text_file`` decodes: its 1KB read pulls one text-mode chunk from disk
+    TEXT_CHECK_BYTES = 8192
+    
+    def _head_is_text(self, head: bytes, at_end: bool) -> bool:
+        """Whether ``_is_text_file`` would accept a file starting with ``head``
+        
+        ``at_end`` tells whether ``head`` holds the whole file; otherwise a multibyte
+        character cut off at the end is not an error.
+        """
+        head = head[:self.TEXT_CHECK_BYTES]
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=at_end)
+        except UnicodeDecodeError:
+            return False
+        return True
+    
+    def _decode_entry(self, entry: SourceEntry, max_size: int) -> Optional[str]:
+        """Text of a source entry as ``_read_file_content`` would give it, or None if binary"""
+        if entry.size > max_size:
+            # Like a directory export, the notice is only given for files that look like text
+            head = entry.read(self.TEXT_CHECK_BYTES)
+            if not self._head_is_text(head, entry.size <= self.TEXT_CHECK_BYTES):
+                return None
+            return self._too_large_notice(entry.size, max_size)
+        
+        data = entry.read()
+        if not self._head_is_text(data, len(data) <= self.TEXT_CHECK_BYTES):
+            return None
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            # Files that pass the text check but cannot be decoded in full
+            return "[BINARY FILE - Cannot display content as text]"
+        # Text-mode reads translate newlines; keep archive exports identical to disk ones
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+    
+    def _export_source(self, deleted_files: Optional[List[Path]], keep_content: bool) -> Dict:
+        """Export the entries of ``self.source`` as they stream, without extracting them"""
+        max_file_size = self.config.get('max_file_size', 1000000)
+        self.files_excluded = 0
+        self.file_aliases = []
+        
+        session = ExportSession(self, keep_content)
+        try:
+            session.begin()
             
-            # Write everything to output file
-            combined_content = ''.join(all_content)
-            with open(self.output_file, 'w', encoding='utf-8') as outf:
-                outf.write(combined_content)
+            for entry in self.source.iter_entries(self._skip_entry):
+                relative_path = entry.relative_path
+                # Shown where a directory export shows the absolute path
+                display_path = Path(f"{self.source.location}!") / relative_path
+                
+                try:
+                    if entry.size > max_file_size * 2:  # Skip very large files entirely
+                        session.skip_file(relative_path, entry.size, entry.mtime_ns)
+                        continue
+                    
+                    content = self._decode_entry(entry, max_file_size)
+                    if content is None:
+                        session.skip_file(relative_path, entry.size, entry.mtime_ns)
+                        continue
+                    
+                    session.add_file(relative_path, display_path, entry.size, entry.mtime_ns, content)
+                    
+                except BrokenPipeError:
+                    raise
+                except Exception as e:
+                    # Log error but continue
+                    session.add_error(relative_path, str(e))
             
-            return {
-                'files_processed': files_processed,
-                'files_skipped': files_skipped,
-                'total_size': total_size,
-                'output_file': str(self.output_file),
-                'content': combined_content
-            }
+            return session.finish(deleted_files)
             
+        except BrokenPipeError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Export failed: {e}")
+        finally:
+            session.close()
+    
+    def _source_label(self) -> str:
+        """Where the exported files come from, for headers and summaries"""
+        return self.source.label if self.source is not None else str(self.source_dir)
     
     def _create_header(self) -> str:
-        """Create LLM-optimized file header"""
+        """Create LLM-optimized export header"""
         preset_name = self.config.get('name', 'Custom')
-        return (
-            f"{'='*100}\n"
-            f"LLM CONTEXT EXPORT\n"
-            f"{'='*100}\n"
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            f"Source: {self.source_dir}\n"
-            f"Preset: {preset_name}\n"
-            f"Export Tool: llm-context-builder\n"
-            f"{'='*100}\n\n"
-            f"INSTRUCTIONS FOR LLM:\n"
-            f"This file contains the complete source code and documentation for a project.\n"
-            f"Each file is clearly marked with headers and footers.\n"
-            f"Use this context to understand the project structure and help with development tasks.\n"
-            f"{'='*100}\n"
-        )
+        if self.config.get('reproducible', False):
+            # Volatile fields would break prompt-cache prefixes; they go in the summary
+            return self.format.document_header([('Preset', preset_name)])
+        return self.format.document_header([
+            ('Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            ('Source', self._source_label()),
+            ('Preset', preset_name),
+        ])
     
     def _create_summary(self, files_processed: int, files_skipped: int, total_size: int) -> str:
         """Create summary section"""
-        return (
-            f"\n\n{'='*100}\n"
-            f"EXPORT SUMMARY\n"
-            f"{'='*100}\n"
-            f"Files processed: {files_processed:,}\n"
-            f"Files skipped: {files_skipped:,}\n"
-            f"Total content size: {total_size:,} bytes\n"
-            f"Export completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            f"Output file: {self.output_file}\n"
-            f"{'='*100}\n"
-        )
\ No newline at end of file
+        fields = [
+            ('Files processed', f"{files_processed:,}"),
+            ('Files skipped', f"{files_skipped:,}"),
+            ('Total content size', f"{total_size:,} bytes"),
+        ]
+        if self.config.get('reproducible', False):
+            fields.append(('Source', self._source_label()))
+        fields += [
+            ('Export completed', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            ('Output file', self._output_label()),
+        ]
+        return self.format.summary(fields)
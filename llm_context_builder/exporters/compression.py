@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Compression - Incremental gzip/bz2/xz compression of export output
+"""
+
+import bz2
+import io
+import lzma
+import queue
+import threading
+import time
+import zlib
+from typing import BinaryIO, Dict, Optional
+
+# Codec name -> (file suffix, compressor factory); all are stdlib, streaming compressors
+CODECS: Dict[str, tuple] = {
+    # wbits 31 = deflate with a gzip header and trailer, readable by gzip/zcat
+    'gzip': ('.gz', lambda: zlib.compressobj(6, zlib.DEFLATED, 31)),
+    'bz2': ('.bz2', lambda: bz2.BZ2Compressor(9)),
+    'xz': ('.xz', lambda: lzma.LZMACompressor(format=lzma.FORMAT_XZ)),
+}
+
+# Text is handed to the compressor in blocks of this size; larger blocks amortise the
+# per-call overhead and let the codecs release the GIL for longer stretches
+BLOCK_SIZE = 256 * 1024
+
+# Blocks allowed to wait for the compression thread before writers block
+QUEUE_BLOCKS = 8
+
+
+def get_codec_suffix(codec: str) -> str:
+    """File suffix conventionally used for a codec ('.gz', '.bz2', '.xz')"""
+    try:
+        return CODECS[codec][0]
+    except KeyError:
+        available = ', '.join(sorted(CODECS))
+        raise ValueError(f"Unknown compression codec: {codec} (available: {available})")
+
+
+class CompressedWriter(io.BufferedIOBase):
+    """Binary stream that compresses everything written to it into another stream
+
+    Data is compressed block by block as the export is written, so the plain text never
+    exists in full. With ``threaded``, blocks are compressed and written on a background
+    thread while the caller goes on reading files; the bounded queue between them
+    keeps memory flat when the compressor is the slower side.
+    """
+
+    def __init__(self, raw: BinaryIO, codec: str, threaded: bool = False,
+                 close_raw: bool = True):
+        get_codec_suffix(codec)  # Validate the name
+        self.raw = raw
+        self.codec = codec
+        self.close_raw = close_raw
+        self._compressor = CODECS[codec][1]()
+        self._pending = bytearray()
+
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_seconds = 0.0
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        if threaded:
+            self._queue = queue.Queue(maxsize=QUEUE_BLOCKS)
+            self._thread = threading.Thread(target=self._drain, name='export-compressor', daemon=True)
+            self._thread.start()
+
+    def writable(self) -> bool:
+        return True
+
+    def _compress(self, block: bytes, final: bool = False) -> None:
+        """Compress one block, or flush the codec's remaining output, and write the result"""
+        started = time.perf_counter()
+        data = self._compressor.flush() if final else self._compressor.compress(block)
+        self.compress_seconds += time.perf_counter() - started
+        if data:
+            self.raw.write(data)
+            self.bytes_out += len(data)
+
+    def _drain(self) -> None:
+        """Compression thread: compress queued blocks until the end marker"""
+        while True:
+            block = self._queue.get()
+            if block is None:
+                break
+            if self._error is not None:
+                continue  # Keep consuming so the writer never blocks on a dead thread
+            try:
+                self._compress(block)
+            except BaseException as e:
+                self._error = e
+
+    def _check_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _hand_off(self, block: bytes) -> None:
+        """Pass a block to the compressor, on the background thread if there is one"""
+        if self._queue is not None:
+            self._check_error()
+            self._queue.put(block)
+        else:
+            self._compress(block)
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("write to closed compressed stream")
+        self._pending += data
+        self.bytes_in += len(data)
+        if len(self._pending) >= BLOCK_SIZE:
+            self._hand_off(bytes(self._pending))
+            self._pending.clear()
+        return len(data)
+
+    def flush(self) -> None:
+        """Hand buffered text to the compressor
+
+        The codec itself is not flushed: forcing out partial blocks after every file
+        would cost most of the compression ratio. A streaming reader therefore receives
+        output in codec-sized pieces.
+        """
+        if self.closed:
+            return
+        if self._pending:
+            self._hand_off(bytes(self._pending))
+            self._pending.clear()
+        if self._queue is None:
+            self.raw.flush()
+
+    def close(self) -> None:
+        """Finish the compressed stream; the underlying stream is closed if owned"""
+        if self.closed:
+            return
+        try:
+            self.flush()
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._check_error()
+            self._compress(b'', final=True)
+            self.raw.flush()
+            self._finished = time.perf_counter()
+        finally:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(None)  # Never leave the compression thread waiting
+            super().close()
+            if self.close_raw:
+                self.raw.close()
+
+    def stats(self) -> Dict:
+        """Sizes, ratio and throughput of the compressed output"""
+        elapsed = (self._finished or time.perf_counter()) - self._started
+        return {
+            'codec': self.codec,
+            'threaded': self._thread is not None,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': round(self.bytes_in / self.bytes_out, 3) if self.bytes_out else None,
+            # Uncompressed megabytes per second of time spent inside the codec
+            'compress_seconds': round(self.compress_seconds, 4),
+            'compress_mb_per_s': round(self.bytes_in / 1e6 / self.compress_seconds, 2)
+            if self.compress_seconds else None,
+            'elapsed_seconds': round(elapsed, 4),
+        }
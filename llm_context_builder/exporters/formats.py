@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Export Formats - Registry of output layouts for exported files
+
+Each format renders the pieces of an export (document header, per-file framing,
+deleted-file list, summary) from templates prepared once at import time, so the
+exporter can stream sections without rebuilding rulers and labels for every file.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple, Type
+from xml.sax.saxutils import quoteattr
+
+# Ordered (label, value) pairs, e.g. [('Preset', 'Python Project'), ...]
+Fields = List[Tuple[str, str]]
+
+FORMATS: Dict[str, Type['ExportFormat']] = {}
+
+
+def register_format(format_class: Type['ExportFormat']) -> Type['ExportFormat']:
+    """Class decorator adding a format to the registry under its ``name``"""
+    FORMATS[format_class.name] = format_class
+    return format_class
+
+
+def get_format(name: str) -> 'ExportFormat':
+    """Instantiate a registered format by name"""
+    try:
+        return FORMATS[name]()
+    except KeyError:
+        available = ', '.join(sorted(FORMATS))
+        raise ValueError(f"Unknown export format: {name} (available: {available})")
+
+
+def _field_key(label: str) -> str:
+    """Machine-readable key for a field label ('Files processed' -> 'files_processed')"""
+    return label.lower().replace(' ', '_')
+
+
+class ExportFormat:
+    """Base class for export formats"""
+
+    name = ''
+    description = ''
+    extension = '.txt'
+
+    def document_header(self, fields: Fields) -> str:
+        """Text written once before any file"""
+        raise NotImplementedError
+
+    def render_file(self, relative_path: Path, file_path: Path, size: int,
+                    content: str) -> Tuple[str, str, str]:
+        """Return (prefix, body, suffix) for one file; prefix and suffix are pure framing"""
+        raise NotImplementedError
+
+    def file_error(self, relative_path: Path, message: str) -> str:
+        """Section written when a file could not be exported"""
+        raise NotImplementedError
+
+    def deleted_files(self, paths: List[Path]) -> str:
+        """Compact list of paths deleted since the comparison point"""
+        raise NotImplementedError
+
+    def file_aliases(self, aliases: List[Tuple[Path, Path]]) -> str:
+        """List of (alias, primary) paths for files emitted once but reachable by several paths"""
+        raise NotImplementedError
+
+    def summary(self, fields: Fields) -> str:
+        """Text written once after all files"""
+        raise NotImplementedError
+
+
+@register_format
+class ClassicFormat(ExportFormat):
+    """The original layout: ruled headers and footers with full path and size"""
+
+    name = 'classic'
+    description = 'Ruled FILE/END blocks with absolute path and size (default)'
+
+    _RULE = '=' * 80
+    _WIDE_RULE = '=' * 100
+    _FILE_HEADER = f"\n{_RULE}\nFILE: {{path}}\nPATH: {{abs_path}}\nSIZE: {{size:,}} bytes\n{_RULE}\n"
+    _FILE_FOOTER = f"\n{_RULE}\nEND: {{path}}\n{_RULE}\n"
+    _FILE_ERROR = f"\n{_RULE}\nFILE: {{path}}\nERROR: {{message}}\n{_RULE}\n"
+    _DELETED = f"\n{_RULE}\nDELETED FILES ({{count:,}})\n{_RULE}\n{{paths}}\n"
+    _ALIASES = f"\n{_RULE}\nALIASES ({{count:,}}) - same file as the path after '->'\n{_RULE}\n{{lines}}\n"
+    _HEADER_TOP = f"{_WIDE_RULE}\nLLM CONTEXT EXPORT\n{_WIDE_RULE}\n"
+    _HEADER_BOTTOM = (
+        f"Export Tool: llm-context-builder\n"
+        f"{_WIDE_RULE}\n\n"
+        f"INSTRUCTIONS FOR LLM:\n"
+        f"This file contains the complete source code and documentation for a project.\n"
+        f"Each file is clearly marked with headers and footers.\n"
+        f"Use this context to understand the project structure and help with development tasks.\n"
+        f"{_WIDE_RULE}\n"
+    )
+    _SUMMARY_TOP = f"\n\n{_WIDE_RULE}\nEXPORT SUMMARY\n{_WIDE_RULE}\n"
+    _SUMMARY_BOTTOM = f"{_WIDE_RULE}\n"
+
+    def document_header(self, fields: Fields) -> str:
+        lines = ''.join(f"{label}: {value}\n" for label, value in fields)
+        return self._HEADER_TOP + lines + self._HEADER_BOTTOM
+
+    def render_file(self, relative_path: Path, file_path: Path, size: int,
+                    content: str) -> Tuple[str, str, str]:
+        prefix = self._FILE_HEADER.format(path=relative_path, abs_path=file_path, size=size)
+        suffix = self._FILE_FOOTER.format(path=relative_path)
+        # Ensure content ends with newline
+        if not content.endswith('\n'):
+            suffix = '\n' + suffix
+        return prefix, content, suffix
+
+    def file_error(self, relative_path: Path, message: str) -> str:
+        return self._FILE_ERROR.format(path=relative_path, message=message)
+
+    def deleted_files(self, paths: List[Path]) -> str:
+        listing = '\n'.join(Path(path).as_posix() for path in paths)
+        return self._DELETED.format(count=len(paths), paths=listing)
+
+    def file_aliases(self, aliases: List[Tuple[Path, Path]]) -> str:
+        lines = '\n'.join(f"{alias.as_posix()} -> {primary.as_posix()}" for alias, primary in aliases)
+        return self._ALIASES.format(count=len(aliases), lines=lines)
+
+    def summary(self, fields: Fields) -> str:
+        lines = ''.join(f"{label}: {value}\n" for label, value in fields)
+        return self._SUMMARY_TOP + lines + self._SUMMARY_BOTTOM
+
+
+@register_format
+class CompactFormat(ExportFormat):
+    """Minimal framing: one delimiter line per file, no footer or absolute path"""
+
+    name = 'compact'
+    description = "One '=== path ===' line per file, no footers"
+
+    _FILE_HEADER = "=== {path} ===\n"
+    _HEADER = (
+        "LLM CONTEXT EXPORT\n"
+        "{fields}"
+        "Each file starts with a line '=== <path> ===' and runs until the next such line.\n\n"
+    )
+
+    def document_header(self, fields: Fields) -> str:
+        return self._HEADER.format(fields=''.join(f"{label}: {value}\n" for label, value in fields))
+
+    def render_file(self, relative_path: Path, file_path: Path, size: int,
+                    content: str) -> Tuple[str, str, str]:
+        suffix = '' if content.endswith('\n') else '\n'
+        return self._FILE_HEADER.format(path=relative_path.as_posix()), content, suffix
+
+    def file_error(self, relative_path: Path, message: str) -> str:
+        return f"=== {relative_path.as_posix()} === [ERROR: {message}]\n"
+
+    def deleted_files(self, paths: List[Path]) -> str:
+        return "=== [deleted] ===\n" + ''.join(f"{Path(path).as_posix()}\n" for path in paths)
+
+    def file_aliases(self, aliases: List[Tuple[Path, Path]]) -> str:
+        return "=== [aliases] ===\n" + ''.join(
+            f"{alias.as_posix()} -> {primary.as_posix()}\n" for alias, primary in aliases
+        )
+
+    def summary(self, fields: Fields) -> str:
+        return "=== [summary] ===\n" + ''.join(f"{label}: {value}\n" for label, value in fields)
+
+
+@register_format
+class MarkdownFormat(ExportFormat):
+    """Markdown sections with fenced, language-tagged code blocks"""
+
+    name = 'markdown'
+    description = 'Markdown headings with fenced code blocks'
+    extension = '.md'
+
+    LANGUAGES = {
+        '.py': 'python', '.pyi': 'python', '.js': 'javascript', '.jsx': 'jsx',
+        '.ts': 'typescript', '.tsx': 'tsx', '.json': 'json', '.md': 'markdown',
+        '.html': 'html', '.css': 'css', '.scss': 'scss', '.yaml': 'yaml', '.yml': 'yaml',
+        '.toml': 'toml', '.sh': 'bash', '.rs': 'rust', '.go': 'go', '.java': 'java',
+        '.kt': 'kotlin', '.swift': 'swift', '.dart': 'dart', '.c': 'c', '.h': 'c',
+        '.cpp': 'cpp', '.rb': 'ruby', '.php': 'php', '.sql': 'sql', '.vue': 'vue',
+    }
+    _BACKTICK_RUN = re.compile(r'`{3,}')
+    _FILE_HEADER = "\n## {path}\n\n{fence}{language}\n"
+    _FILE_FOOTER = "{fence}\n"
+
+    def document_header(self, fields: Fields) -> str:
+        lines = ''.join(f"- {label}: {value}\n" for label, value in fields)
+        return (
+            "# LLM Context Export\n\n"
+            f"{lines}\n"
+            "Each file is a section headed by its path, with its content in a fenced code block.\n"
+        )
+
+    def render_file(self, relative_path: Path, file_path: Path, size: int,
+                    content: str) -> Tuple[str, str, str]:
+        # The fence must be longer than any backtick run inside the content
+        longest = max((len(run) for run in self._BACKTICK_RUN.findall(content)), default=2)
+        fence = '`' * max(3, longest + 1)
+        language = self.LANGUAGES.get(relative_path.suffix.lower(), '')
+        prefix = self._FILE_HEADER.format(path=relative_path.as_posix(), fence=fence, language=language)
+        suffix = self._FILE_FOOTER.format(fence=fence)
+        if not content.endswith('\n'):
+            suffix = '\n' + suffix
+        return prefix, content, suffix
+
+    def file_error(self, relative_path: Path, message: str) -> str:
+        return f"\n## {relative_path.as_posix()}\n\n> Error: {message}\n"
+
+    def deleted_files(self, paths: List[Path]) -> str:
+        return "\n## Deleted files\n\n" + ''.join(f"- {Path(path).as_posix()}\n" for path in paths)
+
+    def file_aliases(self, aliases: List[Tuple[Path, Path]]) -> str:
+        return "\n## Aliases\n\n" + ''.join(
+            f"- `{alias.as_posix()}` is the same file as `{primary.as_posix()}`\n"
+            for alias, primary in aliases
+        )
+
+    def summary(self, fields: Fields) -> str:
+        return "\n## Export summary\n\n" + ''.join(f"- {label}: {value}\n" for label, value in fields)
+
+
+@register_format
+class XmlFormat(ExportFormat):
+    """XML-style tags around each file; content is emitted verbatim, not escaped"""
+
+    name = 'xml'
+    description = 'Files wrapped in <file path="..."> tags'
+    extension = '.xml'
+
+    _FILE_HEADER = '<file path={path}>\n'
+    _FILE_FOOTER = '</file>\n'
+
+    @staticmethod
+    def _attributes(fields: Fields) -> str:
+        return ''.join(f" {_field_key(label)}={quoteattr(str(value))}" for label, value in fields)
+
+    def document_header(self, fields: Fields) -> str:
+        return f"<export{self._attributes(fields)}>\n"
+
+    def render_file(self, relative_path: Path, file_path: Path, size: int,
+                    content: str) -> Tuple[str, str, str]:
+        prefix = self._FILE_HEADER.format(path=quoteattr(relative_path.as_posix()))
+        suffix = self._FILE_FOOTER if content.endswith('\n') else '\n' + self._FILE_FOOTER
+        return prefix, content, suffix
+
+    def file_error(self, relative_path: Path, message: str) -> str:
+        return f"<error path={quoteattr(relative_path.as_posix())} message={quoteattr(message)}/>\n"
+
+    def deleted_files(self, paths: List[Path]) -> str:
+        return ''.join(f"<deleted path={quoteattr(Path(path).as_posix())}/>\n" for path in paths)
+
+    def file_aliases(self, aliases: List[Tuple[Path, Path]]) -> str:
+        return ''.join(
+            f"<alias path={quoteattr(alias.as_posix())} target={quoteattr(primary.as_posix())}/>\n"
+            for alias, primary in aliases
+        )
+
+    def summary(self, fields: Fields) -> str:
+        return f"<summary{self._attributes(fields)}/>\n</export>\n"
+
+
+@register_format
+class JsonlFormat(ExportFormat):
+    """One JSON object per line: a header record, one record per file, a summary record"""
+
+    name = 'jsonl'
+    description = 'JSON Lines records, one per file'
+    extension = '.jsonl'
+
+    _FILE_PREFIX = '{{"type": "file", "path": {path}, "size": {size}, "content": '
+    _FILE_SUFFIX = '}\n'
+
+    @staticmethod
+    def _record(record_type: str, fields: Fields) -> str:
+        record = {'type': record_type}
+        record.update((_field_key(label), value) for label, value in fields)
+        return json.dumps(record, ensure_ascii=False) + '\n'
+
+    def document_header(self, fields: Fields) -> str:
+        return self._record('header', fields)
+
+    def render_file(self, relative_path: Path, file_path: Path, size: int,
+                    content: str) -> Tuple[str, str, str]:
+        prefix = self._FILE_PREFIX.format(
+            path=json.dumps(relative_path.as_posix(), ensure_ascii=False), size=size
+        )
+        return prefix, json.dumps(content, ensure_ascii=False), self._FILE_SUFFIX
+
+    def file_error(self, relative_path: Path, message: str) -> str:
+        return self._record('error', [('Path', relative_path.as_posix()), ('Message', message)])
+
+    def deleted_files(self, paths: List[Path]) -> str:
+        return json.dumps({'type': 'deleted', 'paths': [Path(p).as_posix() for p in paths]}) + '\n'
+
+    def file_aliases(self, aliases: List[Tuple[Path, Path]]) -> str:
+        mapping = {alias.as_posix(): primary.as_posix() for alias, primary in aliases}
+        return json.dumps({'type': 'aliases', 'aliases': mapping}, ensure_ascii=False) + '\n'
+
+    def summary(self, fields: Fields) -> str:
+        return self._record('summary', fields)
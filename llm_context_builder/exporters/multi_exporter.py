@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Multi Exporter - Several exports of one tree from a single walk and read
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..changes import hash_text
+from ..traversal import walk_tree, walk_tree_claimants
+from .base_exporter import BaseExporter, ExportSession
+
+
+class MultiExporter:
+    """Feeds one directory walk to several exporters, each with its own filters and output
+
+    A folder is pruned only when every target excludes it, and a file is read only
+    once however many targets include it. Each target keeps its own presets' rules
+    (extensions, exclusions, ``max_file_size``), format and streaming destination, so
+    its output is the same as a separate ``BaseExporter.export`` run would produce.
+    """
+
+    def __init__(self, targets: List[BaseExporter], walk_workers: int = 1,
+                 follow_symlinks: bool = False):
+        if not targets:
+            raise ValueError("At least one export target is required")
+        source_dirs = {target.source_dir for target in targets}
+        if len(source_dirs) > 1:
+            raise ValueError("All export targets must share the same source directory")
+
+        self.targets = targets
+        self.source_dir = targets[0].source_dir
+        self.walk_workers = walk_workers
+        self.follow_symlinks = follow_symlinks
+
+        # Bytes read from disk during the last export, for comparison with separate runs
+        self.bytes_read = 0
+
+    def _should_exclude_folder(self, folder_name: str) -> bool:
+        """Prune a folder only if no target wants anything below it"""
+        return all(target._should_exclude_folder(folder_name) for target in self.targets)
+
+    def _is_output_file(self, file_path: Path) -> bool:
+        """Whether a walked file is one of the exports being written, or a manifest of one"""
+        return any(target.is_own_output(file_path) for target in self.targets)
+
+    def _walk_directories(self):
+        """Yield (directory, file names, targets whose own walk would visit the directory)"""
+        if self.follow_symlinks:
+            # A directory reachable by several paths is claimed per target, at the first
+            # path that target's folder rules let it reach
+            folder_filters = [target._should_exclude_folder for target in self.targets]
+            for root, files, owners in walk_tree_claimants(str(self.source_dir), folder_filters,
+                                                           self.walk_workers):
+                yield root, files, [self.targets[index] for index in owners]
+            return
+
+        for root, files in walk_tree(str(self.source_dir), self._should_exclude_folder,
+                                     self.walk_workers):
+            # Targets whose folder rules reject this directory see none of its files
+            folders = Path(root).relative_to(self.source_dir).parts
+            active = [
+                target for target in self.targets
+                if not any(target._should_exclude_folder(part) for part in folders)
+            ]
+            yield root, files, active
+
+    def _walk(self):
+        """Yield (file path, targets including it), recording per-target exclusions and aliases"""
+        for target in self.targets:
+            target.files_excluded = 0
+            target.file_aliases = []
+
+        # Physical file -> first path each target received it at; a separate run of a
+        # target would claim the inode at the first path that target accepts
+        seen_files: Dict[tuple, Dict[BaseExporter, Path]] = {}
+        own_names = {name for target in self.targets for name in target._own_output_files()}
+        for root, files, active in self._walk_directories():
+            if not active:
+                continue
+
+            for file in files:
+                file_path = Path(root) / file
+
+                if file in own_names and self._is_output_file(file_path):
+                    continue
+
+                wanted = []
+                for target in active:
+                    if target._should_exclude_file(file_path)[0]:
+                        target.files_excluded += 1
+                    else:
+                        wanted.append(target)
+                if not wanted:
+                    continue
+
+                if self.follow_symlinks:
+                    try:
+                        file_stat = file_path.stat()
+                    except OSError:
+                        continue  # Dangling symlink
+                    key = (file_stat.st_dev, file_stat.st_ino)
+                    primaries = seen_files.setdefault(key, {})
+                    first_seen = []
+                    for target in wanted:
+                        if target in primaries:
+                            target.file_aliases.append((file_path, primaries[target]))
+                        else:
+                            primaries[target] = file_path
+                            first_seen.append(target)
+                    wanted = first_seen
+                    if not wanted:
+                        continue
+
+                yield file_path, wanted
+
+    def _export_file(self, file_path: Path, wanted: List[BaseExporter],
+                     sessions: Dict[BaseExporter, ExportSession]) -> None:
+        """Add one walked file to the export of every target that includes it"""
+        relative_path = file_path.relative_to(self.source_dir)
+        file_stat = file_path.stat()
+        file_size = file_stat.st_size
+
+        # Very large files are dropped per target, exactly as a single export would
+        included = []
+        for target in wanted:
+            if file_size > target.config.get('max_file_size', 1000000) * 2:
+                sessions[target].skip_file(relative_path, file_size, file_stat.st_mtime_ns)
+            else:
+                included.append(target)
+        if not included:
+            return
+
+        if not included[0]._is_text_file(file_path):
+            for target in included:
+                sessions[target].skip_file(relative_path, file_size, file_stat.st_mtime_ns)
+            return
+
+        # One read serves every target the file fits in whole; the others only need
+        # the size for their "too large" notice
+        full_text: Optional[str] = None
+        full_hash: Optional[str] = None
+        for target in included:
+            max_file_size = target.config.get('max_file_size', 1000000)
+            if file_size > max_file_size:
+                content = target._read_file_content(file_path, max_file_size)
+                sessions[target].add_file(relative_path, file_path, file_size,
+                                          file_stat.st_mtime_ns, content)
+                continue
+            if full_text is None:
+                full_text = target._read_file_content(file_path)
+                full_hash = hash_text(full_text)
+                self.bytes_read += file_size
+            sessions[target].add_file(relative_path, file_path, file_size, file_stat.st_mtime_ns,
+                                      full_text, full_hash)
+
+    def export(self, keep_content: bool = False) -> List[Dict]:
+        """Write every target's export and return their results, in target order"""
+        sessions: Dict[BaseExporter, ExportSession] = {}
+        try:
+            for target in self.targets:
+                sessions[target] = ExportSession(target, keep_content)
+            for session in sessions.values():
+                session.begin()
+
+            self.bytes_read = 0
+            for file_path, wanted in self._walk():
+                try:
+                    self._export_file(file_path, wanted, sessions)
+                except BrokenPipeError:
+                    raise
+                except Exception as e:
+                    # Log error but continue, in every export that did not get the file yet
+                    relative_path = file_path.relative_to(self.source_dir)
+                    for target in wanted:
+                        if relative_path.as_posix() not in sessions[target].manifest:
+                            sessions[target].add_error(relative_path, str(e))
+
+            return [sessions[target].finish() for target in self.targets]
+
+        except BrokenPipeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Export failed: {e}")
+        finally:
+            for session in sessions.values():
+                session.close()
@@ -4,6 +4,7 @@ LLM Context Builder - Main CLI interface
 Export any project to a single text file optimized for LLM context
 """
 
+import json
 import os
 import sys
 import time
@@ -14,11 +15,32 @@ import click
 from colorama import init, Fore, Style
 
 from .project_detector import ProjectDetector
-from .exporters.base_exporter import BaseExporter
+from .exporters.base_exporter import BaseExporter, STDOUT_MARKER
+from .exporters.compression import CODECS, get_codec_suffix
+from .exporters.formats import FORMATS, get_format
+from .exporters.multi_exporter import MultiExporter
+from .search_index import SearchIndex
+from .cache import TokenCache
+from .tokens import TokenCounter
+from .estimator import ExportEstimator
+from .sources import open_source
+from .changes import (
+    carry_change_counts, changes_since_ref, changes_since_manifest, load_manifest,
+    manifest_path_for, write_manifest
+)
+from .ordering import git_change_counts, manifest_change_counts, order_by_stability, shared_prefix_length
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+# Small source file rendered by --list-formats; quotes, backslashes and indented lines
+# show the escaping cost of formats that encode file content
+LIST_FORMATS_SAMPLE = (
+    'def greet(name):\n'
+    '    """Return a greeting"""\n'
+    '    return f"Hello, {name}!\\n"\n'
+)
+
 # Project presets configuration
 PRESETS = {
     "web": {
@@ -81,43 +103,139 @@ PRESETS = {
 
 def estimate_tokens(text):
     """Rough token estimation for OpenAI models"""
-    try:
-        import tiktoken
-        encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 encoding
-        return len(encoding.encode(text))
-    except ImportError:
-        # Fallback: rough estimation (1 token ≈ 4 characters)
-        return len(text) // 4
+    return TokenCounter().count(text)
+
+# Status output moves to stderr when the export itself is streamed to stdout
+_status_to_stderr = False
+
+def echo_status(message):
+    """Print a status line without mixing it into a streamed export"""
+    click.echo(message, err=_status_to_stderr)
 
 def print_success(message):
     """Print success message in green"""
-    click.echo(f"{Fore.GREEN}✅ {message}{Style.RESET_ALL}")
+    echo_status(f"{Fore.GREEN}✅ {message}{Style.RESET_ALL}")
 
 def print_info(message):
     """Print info message in blue"""
-    click.echo(f"{Fore.BLUE}📁 {message}{Style.RESET_ALL}")
+    echo_status(f"{Fore.BLUE}📁 {message}{Style.RESET_ALL}")
 
 def print_stats(message):
     """Print stats in yellow"""
-    click.echo(f"{Fore.YELLOW}📊 {message}{Style.RESET_ALL}")
+    echo_status(f"{Fore.YELLOW}📊 {message}{Style.RESET_ALL}")
 
 def print_tokens(message):
     """Print token info in magenta"""
-    click.echo(f"{Fore.MAGENTA}🔤 {message}{Style.RESET_ALL}")
+    echo_status(f"{Fore.MAGENTA}🔤 {message}{Style.RESET_ALL}")
 
 def print_warning(message):
     """Print warning in yellow"""
-    click.echo(f"{Fore.YELLOW}⚠️  {message}{Style.RESET_ALL}")
+    echo_status(f"{Fore.YELLOW}⚠️  {message}{Style.RESET_ALL}")
 
 def print_error(message):
     """Print error in red"""
-    click.echo(f"{Fore.RED}❌ {message}{Style.RESET_ALL}")
+    echo_status(f"{Fore.RED}❌ {message}{Style.RESET_ALL}")
+
+def print_compression(stats):
+    """Print compressed size, ratio and codec throughput of an export"""
+    if stats is None:
+        return
+    line = f"Compressed ({stats['codec']}): {stats['bytes_in']:,} -> {stats['bytes_out']:,} bytes"
+    if stats['ratio']:
+        line += f" ({stats['ratio']:.1f}x)"
+    if stats['compress_mb_per_s']:
+        line += f", {stats['compress_mb_per_s']:.1f} MB/s"
+    if stats['threaded']:
+        line += " on a background thread"
+    print_stats(line)
+
+def apply_overrides(config, max_size=None, include_ext=(), exclude_ext=(), exclude_folders=(),
+                    exclude_files=()):
+    """Apply command line filter options to a preset configuration (copying shared lists)"""
+    if max_size:
+        config['max_file_size'] = max_size
+    if include_ext:
+        config['include_extensions'] = list(include_ext)
+    if exclude_ext:
+        config['exclude_files'] = config.get('exclude_files', []) + [f"*{ext}" for ext in exclude_ext]
+    if exclude_folders:
+        config['exclude_folders'] = config.get('exclude_folders', []) + list(exclude_folders)
+    if exclude_files:
+        config['exclude_files'] = config.get('exclude_files', []) + list(exclude_files)
+    return config
+
+def default_output_path(source_name, export_format, no_timestamp, label=None, compress=None):
+    """project_export/PROJECT[_LABEL]_TIMESTAMP.ext[.gz] in the current directory"""
+    export_dir = Path.cwd() / "project_export"
+    export_dir.mkdir(exist_ok=True)
+    
+    # Generate filename based on project name
+    project_name = source_name.lower().replace(' ', '_').replace('-', '_')
+    if label:
+        project_name = f"{project_name}_{label}"
+    extension = FORMATS[export_format].extension
+    if compress:
+        extension += get_codec_suffix(compress)
+    if no_timestamp:
+        filename = f"{project_name}_export{extension}"
+    else:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{project_name}_{timestamp}{extension}"
+    
+    return export_dir / filename
+
+# Keys a targets file may set on top of the preset it names
+TARGET_KEYS = {
+    'name', 'include_extensions', 'exclude_extensions', 'exclude_folders', 'exclude_files',
+    'max_file_size',
+}
+
+def parse_target_option(value):
+    """Turn '--target PRESET[=OUTPUT]' into a target description"""
+    preset, _, output = value.partition('=')
+    return {'preset': preset, 'output': output or None}
+
+def load_targets_file(path):
+    """Read export targets from a JSON file: a list, or an object with a 'targets' list"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise click.BadParameter(f"Cannot read targets file {path}: {e}")
+    
+    targets = data.get('targets') if isinstance(data, dict) else data
+    if not isinstance(targets, list) or not all(isinstance(t, dict) for t in targets):
+        raise click.BadParameter(f"Targets file {path} must contain a list of target objects")
+    return targets
+
+def build_target_config(target, default_format, overrides):
+    """Configuration of one export target: its preset, its own settings, then CLI overrides"""
+    preset = target.get('preset', 'full')
+    if preset not in PRESETS:
+        raise click.BadParameter(
+            f"Unknown preset in export target: {preset} (available: {', '.join(PRESETS)})"
+        )
+    export_format = target.get('format', default_format)
+    if export_format not in FORMATS:
+        raise click.BadParameter(f"Unknown format in export target: {export_format}")
+    unknown = set(target) - TARGET_KEYS - {'preset', 'output', 'format'}
+    if unknown:
+        raise click.BadParameter(f"Unknown keys in export target: {', '.join(sorted(unknown))}")
+    
+    config = PRESETS[preset].copy()
+    config.update((key, value) for key, value in target.items() if key in TARGET_KEYS)
+    config['format'] = export_format
+    return apply_overrides(config, **overrides)
 
 @click.command()
-@click.argument('source_dir', default='.', type=click.Path(exists=True, file_okay=False, dir_okay=True))
-@click.option('-o', '--output', help='Output file path (default: project_export/PROJECT_NAME_TIMESTAMP.txt)')
+@click.argument('source_dir', default='.', type=click.Path(exists=True, file_okay=True, dir_okay=True))
+@click.option('-o', '--output',
+              help="Output file path, or '-' to stream to stdout (default: project_export/PROJECT_NAME_TIMESTAMP.txt)")
 @click.option('--preset', type=click.Choice(list(PRESETS.keys())), help='Use a predefined project preset')
 @click.option('--list-presets', is_flag=True, help='List all available presets and exit')
+@click.option('--format', 'export_format', type=click.Choice(sorted(FORMATS)), default='classic',
+              show_default=True, help='Output layout')
+@click.option('--list-formats', is_flag=True, help='List output formats with their per-file overhead and exit')
 @click.option('--count-tokens', is_flag=True, help='Estimate token count for LLM context')
 @click.option('--max-size', type=int, help='Maximum file size in bytes to include')
 @click.option('--exclude-ext', multiple=True, help='Additional file extensions to exclude')
@@ -127,13 +245,45 @@ def print_error(message):
 @click.option('--no-timestamp', is_flag=True, help='Disable timestamp in output filename')
 @click.option('--quiet', is_flag=True, help='Minimal output')
 @click.option('--auto-detect/--no-auto-detect', default=True, help='Auto-detect project type and suggest preset')
-def cli(source_dir, output, preset, list_presets, count_tokens, max_size, exclude_ext, 
-        exclude_folders, exclude_files, include_ext, no_timestamp, quiet, auto_detect):
+@click.option('--query', help='Only export the files most relevant to this query')
+@click.option('--top-k', type=int, default=20, show_default=True, help='Number of files to export with --query')
+@click.option('--since', 'since_ref', metavar='REF', help='Only export files changed since this git ref')
+@click.option('--since-export', type=click.Path(exists=True, dir_okay=False),
+              help='Only export files changed since a previous export (or its manifest)')
+@click.option('--walk-workers', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Threads used to traverse directories (helps on network filesystems)')
+@click.option('--no-token-cache', is_flag=True, help='Tokenize every file instead of reusing cached counts')
+@click.option('--estimate', is_flag=True,
+              help='Quickly project export size from file metadata and a small sample, then exit')
+@click.option('--reproducible', is_flag=True,
+              help='Stable, prompt-cache friendly output: no volatile header fields, rarely-changed files first')
+@click.option('--previous-export', type=click.Path(exists=True, dir_okay=False),
+              help='Previous export (or its manifest) used for ordering and shared-prefix reporting')
+@click.option('--follow-symlinks', is_flag=True,
+              help='Follow directory symlinks; each physical file is exported once, aliases are listed')
+@click.option('--target', 'target_specs', multiple=True, metavar='PRESET[=OUTPUT]',
+              help="Add an export target; several targets share one walk and one read per file")
+@click.option('--targets-file', type=click.Path(exists=True, dir_okay=False),
+              help='JSON file listing export targets (preset, output, format and filter overrides)')
+@click.option('--commit', metavar='REF',
+              help='Export the files of this git commit instead of the working tree')
+@click.option('--compress', type=click.Choice(sorted(CODECS)),
+              help='Compress the export while writing it (default filenames get the codec suffix)')
+@click.option('--compress-thread', is_flag=True,
+              help='Compress on a background thread, overlapping with file reading')
+def cli(source_dir, output, preset, list_presets, export_format, list_formats, count_tokens,
+        max_size, exclude_ext, exclude_folders, exclude_files, include_ext, no_timestamp, quiet,
+        auto_detect, query, top_k, since_ref, since_export, walk_workers, no_token_cache, estimate,
+        reproducible, previous_export, follow_symlinks, target_specs, targets_file, commit,
+        compress, compress_thread):
     """
     Export any project to a single text file optimized for LLM context.
     
     Works in any directory - just run 'export_project' and it will export
     the current directory to project_export/PROJECT_NAME_TIMESTAMP.txt
+    
+    SOURCE_DIR may also be a .tar(.gz/.bz2/.xz) or .zip archive, which is
+    streamed without extracting it.
     """
     
     if list_presets:
@@ -143,12 +293,82 @@ def cli(source_dir, output, preset, list_presets, count_tokens, max_size, exclud
             click.echo(f"{Fore.YELLOW}{preset_name:10}{Style.RESET_ALL} - {config['description']}")
         return
     
+    if list_formats:
+        # Framing cost of a typical file, plus whatever escaping its content needs
+        counter = TokenCounter()
+        sample_path = Path('src/package/module.py')
+        sample_file = Path.cwd() / sample_path
+        if not quiet:
+            click.echo(f"\n{Fore.CYAN}📋 Available Formats:{Style.RESET_ALL}\n")
+        for format_name in sorted(FORMATS):
+            prefix, body, suffix = get_format(format_name).render_file(
+                sample_path, sample_file, len(LIST_FORMATS_SAMPLE), LIST_FORMATS_SAMPLE
+            )
+            escaping = counter.count(body) - counter.count(LIST_FORMATS_SAMPLE)
+            overhead = counter.count(prefix + suffix) + escaping
+            click.echo(
+                f"{Fore.YELLOW}{format_name:10}{Style.RESET_ALL} - {FORMATS[format_name].description} "
+                f"(~{overhead} tokens/file)"
+            )
+        return
+    
+    if since_ref and since_export:
+        raise click.UsageError("--since and --since-export are mutually exclusive")
+    
+    overrides = dict(max_size=max_size, include_ext=include_ext, exclude_ext=exclude_ext,
+                     exclude_folders=exclude_folders, exclude_files=exclude_files)
+    
+    targets = [parse_target_option(spec) for spec in target_specs]
+    if targets_file:
+        targets += load_targets_file(targets_file)
+    
+    # Archives and git commits are streamed; modes that need the tree on disk do not apply
+    try:
+        source = open_source(Path(source_dir).resolve(), commit)
+    except (RuntimeError, ValueError) as e:
+        raise click.UsageError(str(e))
+    if source is not None:
+        conflicting = [
+            flag for flag, value in (
+                ('--target/--targets-file', targets), ('--query', query), ('--since', since_ref),
+                ('--since-export', since_export), ('--estimate', estimate),
+                ('--reproducible', reproducible),
+            ) if value
+        ]
+        if conflicting:
+            raise click.UsageError(
+                f"{', '.join(conflicting)} cannot be used with an archive or --commit source"
+            )
+    
+    if targets:
+        conflicting = [
+            flag for flag, value in (
+                ('--output', output), ('--preset', preset), ('--query', query),
+                ('--since', since_ref), ('--since-export', since_export), ('--estimate', estimate),
+                ('--reproducible', reproducible), ('--previous-export', previous_export),
+            ) if value
+        ]
+        if conflicting:
+            raise click.UsageError(
+                f"{', '.join(conflicting)} cannot be combined with --target/--targets-file"
+            )
+        run_multi_export(
+            Path(source_dir).resolve(), targets, export_format, overrides, no_timestamp, quiet,
+            count_tokens, no_token_cache, walk_workers, follow_symlinks, compress, compress_thread
+        )
+        return
+    
+    global _status_to_stderr
+    to_stdout = output == STDOUT_MARKER
+    _status_to_stderr = to_stdout
+    
     start_time = time.time()
     source_path = Path(source_dir).resolve()
     
     if not quiet:
-        click.echo(f"\n{Fore.CYAN}🚀 LLM Context Builder{Style.RESET_ALL}")
-        click.echo(f"{Fore.BLUE}📂 Source: {source_path}{Style.RESET_ALL}")
+        echo_status(f"\n{Fore.CYAN}🚀 LLM Context Builder{Style.RESET_ALL}")
+        source_label = source.label if source is not None else source_path
+        echo_status(f"{Fore.BLUE}📂 Source: {source_label}{Style.RESET_ALL}")
     
     # Auto-detect project type
     detector = ProjectDetector(source_path)
@@ -177,57 +397,181 @@ def cli(source_dir, output, preset, list_presets, count_tokens, max_size, exclud
             config = PRESETS["minimal"].copy()  # Safe fallback
     
     # Override with command line options
-    if max_size:
-        config['max_file_size'] = max_size
-    if include_ext:
-        config['include_extensions'] = list(include_ext)
-    if exclude_ext:
-        config.setdefault('exclude_files', []).extend([f"*{ext}" for ext in exclude_ext])
-    if exclude_folders:
-        config.setdefault('exclude_folders', []).extend(exclude_folders)
-    if exclude_files:
-        config.setdefault('exclude_files', []).extend(exclude_files)
+    apply_overrides(config, **overrides)
+    config['walk_workers'] = walk_workers
+    config['format'] = export_format
+    config['reproducible'] = reproducible
+    config['follow_symlinks'] = follow_symlinks
+    config['compress'] = compress
+    config['compress_thread'] = compress_thread
+    
+    if estimate:
+        estimator = ExportEstimator(
+            BaseExporter(source_dir=source_path, output_file=Path(os.devnull), config=config),
+            TokenCounter()
+        )
+        projection = estimator.estimate()
+        if quiet:
+            click.echo(str(projection['tokens']))
+            return
+        
+        elapsed = time.time() - start_time
+        sample_kind = "tokenized" if projection['exact_sample'] else "estimated"
+        print_stats(
+            f"Projected: {projection['files']:,} files, {projection['bytes']:,} bytes, "
+            f"{projection['files_skipped']:,} skipped"
+        )
+        print_tokens(
+            f"Tokens: ~{projection['tokens']:,} "
+            f"(ratios from {projection['files_sampled']} {sample_kind} sample files)"
+        )
+        if projection['largest_extensions']:
+            print_info("Largest contributors by extension:")
+            for ext, tokens in projection['largest_extensions']:
+                click.echo(f"   {tokens:>12,}  {ext}")
+        if projection['largest_files']:
+            print_info("Largest contributors by file:")
+            for path, tokens in projection['largest_files']:
+                click.echo(f"   {tokens:>12,}  {path}")
+        print_success(f"Estimate completed in {elapsed:.1f}s")
+        return
     
     # Generate output filename
     if output:
         output_file = Path(output)
     else:
         # Create project_export directory in current working directory
-        export_dir = Path.cwd() / "project_export"
-        export_dir.mkdir(exist_ok=True)
-        
-        # Generate filename based on project name
-        project_name = source_path.name.lower().replace(' ', '_').replace('-', '_')
-        if no_timestamp:
-            filename = f"{project_name}_export.txt"
-        else:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{project_name}_{timestamp}.txt"
-        
-        output_file = export_dir / filename
+        source_name = source.name if source is not None else source_path.name
+        output_file = default_output_path(source_name, export_format, no_timestamp, compress=compress)
     
     # Ensure output directory exists
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+    if not to_stdout:
+        output_file.parent.mkdir(parents=True, exist_ok=True)
     
     if not quiet:
-        print_info(f"Output: {output_file}")
+        print_info(f"Output: {'<stdout>' if to_stdout else output_file}")
+    
+    # Token counts are cached per file content, so warm runs only tokenize changed files
+    token_counter = None
+    if count_tokens and not quiet:
+        token_cache = None if no_token_cache else TokenCache()
+        token_counter = TokenCounter(cache=token_cache)
     
     # Create exporter and run
     exporter = BaseExporter(
         source_dir=source_path,
         output_file=output_file,
-        config=config
+        config=config,
+        token_counter=token_counter,
+        source=source
     )
     
     try:
-        result = exporter.export()
+        selected_files = None
+        deleted_files = None
+        previous_manifest = None
+        if since_ref or since_export:
+            if since_ref:
+                changes = changes_since_ref(source_path, since_ref)
+                changes['added'] = [p for p in changes['added'] if not exporter.is_excluded(p)]
+                changes['modified'] = [p for p in changes['modified'] if not exporter.is_excluded(p)]
+                changes['deleted'] = [p for p in changes['deleted'] if not exporter.is_excluded(p)]
+            else:
+                previous_manifest = load_manifest(Path(since_export))
+                changes = changes_since_manifest(source_path, previous_manifest, exporter.iter_files())
+            
+            selected_files = sorted(changes['added'] + changes['modified'])
+            deleted_files = changes['deleted']
+            if not quiet:
+                print_info(
+                    f"Changes: {len(changes['added']):,} added, {len(changes['modified']):,} modified, "
+                    f"{len(changes['deleted']):,} deleted"
+                )
+        
+        if query:
+            # Sync the persistent index with the current walk, then rank against it
+            index = SearchIndex(source_path)
+            try:
+                index_stats = index.update(exporter.iter_file_stats())
+                ranked = index.search(query, top_k, candidates=selected_files)
+            finally:
+                index.close()
+            
+            selected_files = [path for path, score in ranked]
+            if not quiet:
+                print_info(
+                    f"Index: {index_stats['indexed']:,} files "
+                    f"({index_stats['added']:,} added, {index_stats['updated']:,} updated, "
+                    f"{index_stats['removed']:,} removed)"
+                )
+                print_success(f"Query matched {len(selected_files)} files (top {top_k})")
+                for path, score in ranked:
+                    echo_status(f"   {score:7.2f}  {path}")
+        
+        # Baseline for change history and prefix comparison; read before the output is replaced
+        baseline_manifest = previous_manifest
+        if previous_export:
+            baseline_manifest = load_manifest(Path(previous_export))
+        elif baseline_manifest is None and not to_stdout and manifest_path_for(output_file).exists():
+            try:
+                baseline_manifest = load_manifest(manifest_path_for(output_file))
+            except ValueError:
+                baseline_manifest = None
+        
+        if reproducible:
+            if selected_files is None:
+                selected_files = [p.relative_to(source_path) for p in exporter.iter_files()]
+            change_counts = git_change_counts(source_path)
+            if change_counts is None and baseline_manifest is not None:
+                change_counts = manifest_change_counts(baseline_manifest)
+            selected_files = order_by_stability(selected_files, change_counts or {})
+        
+        result = exporter.export(files=selected_files, deleted_files=deleted_files, keep_content=False)
+        
+        if baseline_manifest is not None:
+            carry_change_counts(result['manifest'], baseline_manifest['files'])
+        
+        # Record what was exported so a later run can use --since-export
+        manifest_files = {}
+        if previous_manifest is not None:
+            # Unchanged files carry over so the manifest still describes the whole tree
+            dropped = {p.as_posix() for p in selected_files + deleted_files}
+            manifest_files.update(
+                (key, entry) for key, entry in previous_manifest['files'].items() if key not in dropped
+            )
+        manifest_files.update(result['manifest'])
+        if not to_stdout:
+            write_manifest(
+                manifest_path_for(output_file), source_path, manifest_files, result['checkpoints'],
+                result['compression']
+            )
         
         if not quiet:
             elapsed = time.time() - start_time
             print_stats(f"Files: {result['files_processed']} processed, {result['files_skipped']} skipped")
+            if exporter.file_aliases:
+                print_info(f"Symlinked duplicates listed as aliases: {len(exporter.file_aliases):,}")
+            print_compression(result['compression'])
+            
+            if result['checkpoints'] and baseline_manifest and baseline_manifest.get('checkpoints'):
+                shared = shared_prefix_length(baseline_manifest['checkpoints'], result['checkpoints'])
+                body_size = result['checkpoints'][-1][0]
+                print_stats(
+                    f"Shared prefix with previous export: {shared:,} of {body_size:,} bytes "
+                    f"({shared / max(body_size, 1):.1%})"
+                )
             
-            if count_tokens and result['content']:
-                tokens = estimate_tokens(result['content'])
+            if token_counter is not None and result['tokens'] is not None:
+                tokens = result['tokens']
+                overhead = result['framing_tokens']
+                print_info(
+                    f"Format overhead ({export_format}): ~{overhead:,} tokens "
+                    f"({overhead / max(tokens, 1):.1%} of export)"
+                )
+                if token_counter.cache is not None and token_counter.is_exact:
+                    print_info(
+                        f"Token cache: {token_counter.hits:,} hits, {token_counter.misses:,} tokenized"
+                    )
                 if tokens < 4000:
                     print_tokens(f"Tokens: ~{tokens:,} (fits in GPT-3.5 context)")
                 elif tokens < 8000:
@@ -240,14 +584,115 @@ def cli(source_dir, output, preset, list_presets, count_tokens, max_size, exclud
                     print_warning(f"Tokens: ~{tokens:,} (exceeds most model limits)")
             
             print_success(f"Export completed in {elapsed:.1f}s")
-            print_info(f"Ready for LLM context: {output_file}")
-        else:
+            if not to_stdout:
+                print_info(f"Ready for LLM context: {output_file}")
+        elif not to_stdout:
             # Quiet mode - just print the output file path
             click.echo(str(output_file))
             
+    except BrokenPipeError:
+        # The downstream reader exited early (e.g. `| head`); silence the final flush
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Export failed: {e}")
+        sys.exit(1)
+    finally:
+        if token_counter is not None and token_counter.cache is not None:
+            token_counter.cache.close()
+
+def run_multi_export(source_path, targets, default_format, overrides, no_timestamp, quiet,
+                     count_tokens, no_token_cache, walk_workers, follow_symlinks, compress=None,
+                     compress_thread=False):
+    """Write several exports of one tree from a single walk (--target / --targets-file)"""
+    global _status_to_stderr
+    start_time = time.time()
+    
+    configs = [build_target_config(target, default_format, overrides) for target in targets]
+    outputs = []
+    for target, config in zip(targets, configs):
+        if target.get('output'):
+            outputs.append(Path(target['output']))
+        else:
+            label = target.get('preset', 'full')
+            outputs.append(default_output_path(
+                source_path.name, config['format'], no_timestamp, label, compress
+            ))
+    
+    to_stdout = [str(path) == STDOUT_MARKER for path in outputs]
+    if sum(to_stdout) > 1:
+        raise click.UsageError("Only one export target can stream to stdout")
+    resolved = [path.resolve() for path, stdout in zip(outputs, to_stdout) if not stdout]
+    if len(set(resolved)) != len(resolved):
+        raise click.UsageError("Each export target needs its own output file")
+    _status_to_stderr = any(to_stdout)
+    
+    if not quiet:
+        echo_status(f"\n{Fore.CYAN}🚀 LLM Context Builder{Style.RESET_ALL}")
+        echo_status(f"{Fore.BLUE}📂 Source: {source_path}{Style.RESET_ALL}")
+        print_info(f"Export targets: {len(targets)} (one walk, one read per file)")
+    
+    token_counter = None
+    if count_tokens and not quiet:
+        token_cache = None if no_token_cache else TokenCache()
+        token_counter = TokenCounter(cache=token_cache)
+    
+    exporters = []
+    for output_file, config, stdout in zip(outputs, configs, to_stdout):
+        if not stdout:
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+        config['walk_workers'] = walk_workers
+        config['follow_symlinks'] = follow_symlinks
+        config['compress'] = compress
+        config['compress_thread'] = compress_thread
+        exporters.append(BaseExporter(
+            source_dir=source_path,
+            output_file=output_file,
+            config=config,
+            token_counter=token_counter
+        ))
+    
+    try:
+        multi = MultiExporter(exporters, walk_workers, follow_symlinks)
+        results = multi.export()
+        
+        for exporter, result, stdout in zip(exporters, results, to_stdout):
+            if not stdout:
+                write_manifest(
+                    manifest_path_for(exporter.output_file), source_path, result['manifest'],
+                    result['checkpoints'], result['compression']
+                )
+        
+        if quiet:
+            for exporter, stdout in zip(exporters, to_stdout):
+                if not stdout:
+                    click.echo(str(exporter.output_file))
+            return
+        
+        for exporter, result in zip(exporters, results):
+            line = (
+                f"{exporter.config['name']} -> {result['output_file']}: "
+                f"{result['files_processed']} processed, {result['files_skipped']} skipped"
+            )
+            if result['tokens'] is not None:
+                line += f", ~{result['tokens']:,} tokens"
+            print_stats(line)
+            print_compression(result['compression'])
+        print_info(f"Read {multi.bytes_read:,} bytes once for {len(exporters)} exports")
+        print_success(f"Export completed in {time.time() - start_time:.1f}s")
+    
+    except BrokenPipeError:
+        # The downstream reader exited early (e.g. `| head`); silence the final flush
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
     except Exception as e:
         print_error(f"Export failed: {e}")
         sys.exit(1)
+    finally:
+        if token_counter is not None and token_counter.cache is not None:
+            token_counter.cache.close()
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
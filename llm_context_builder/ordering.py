@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Ordering - Prompt-cache friendly file ordering and export prefix comparison
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .changes import run_git
+
+# How far back git history is consulted for change frequency
+DEFAULT_HISTORY_DEPTH = 1000
+
+
+def git_change_counts(source_dir: Path,
+                      max_commits: int = DEFAULT_HISTORY_DEPTH) -> Optional[Dict[str, int]]:
+    """Number of recent commits touching each file, or None outside a git repository"""
+    try:
+        output = run_git(
+            Path(source_dir),
+            ['log', f"-n{max_commits}", '-z', '--format=', '--name-only', '--no-renames',
+             '--relative', '--', '.']
+        )
+    except (RuntimeError, ValueError):
+        return None
+    paths = (name.strip('\n') for name in output.split('\0'))
+    return dict(Counter(path for path in paths if path))
+
+
+def manifest_change_counts(manifest: Dict) -> Dict[str, int]:
+    """Per-file change counts accumulated in a previous export's manifest"""
+    return {key: entry.get('changes', 0) for key, entry in manifest.get('files', {}).items()}
+
+
+def order_by_stability(files: Sequence[Path], change_counts: Dict[str, int]) -> List[Path]:
+    """Order files rarely-changing first, so successive exports share a long prefix
+
+    Files without history (new or untracked) go last; ties are broken by path so the
+    order is fully deterministic.
+    """
+    unknown = max(change_counts.values(), default=0) + 1
+
+    def key(path: Path):
+        posix = Path(path).as_posix()
+        return change_counts.get(posix, unknown), posix
+
+    return sorted(files, key=key)
+
+
+def shared_prefix_length(previous: Sequence[Sequence], current: Sequence[Sequence]) -> int:
+    """Bytes shared at the start of two exports, at section granularity
+
+    Both arguments are lists of ``(offset, digest)`` checkpoints, where ``digest`` is
+    the hash of the export from its first byte up to ``offset``.
+    """
+    shared = 0
+    for (old_offset, old_digest), (new_offset, new_digest) in zip(previous, current):
+        if old_offset != new_offset or old_digest != new_digest:
+            break
+        shared = new_offset
+    return shared
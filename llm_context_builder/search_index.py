@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Search Index - Persistent BM25 inverted index for query-driven file selection
+"""
+
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache import get_cache_dir, get_project_key
+
+# Bump when the schema or tokenization changes so stale indexes are rebuilt
+INDEX_VERSION = 1
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Path components are strong relevance signals, so they count more than body text
+PATH_WEIGHT = 5
+
+# Only the head of large files is indexed
+MAX_INDEX_BYTES = 256 * 1024
+
+_WORD_RE = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
+_SUBWORD_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, breaking identifiers on camelCase and snake_case"""
+    terms = []
+    for word in _WORD_RE.findall(text):
+        parts = [
+            part.lower()
+            for piece in word.split('_')
+            for part in _SUBWORD_RE.findall(piece)
+        ]
+        if len(parts) > 1 and len(word) <= 64:
+            terms.append(word.lower())
+        terms.extend(part for part in parts if len(part) > 1)
+    return terms
+
+
+def default_index_path(source_dir: Path) -> Path:
+    """Location of the index for a project inside the user cache directory"""
+    return get_cache_dir() / 'index' / f"{get_project_key(source_dir)}.sqlite3"
+
+
+class SearchIndex:
+    """On-disk inverted index over identifiers, path components and text of project files"""
+
+    def __init__(self, source_dir: Path, index_path: Optional[Path] = None):
+        self.source_dir = Path(source_dir)
+        self.index_path = Path(index_path) if index_path else default_index_path(self.source_dir)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.index_path))
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        """Create tables, dropping any index written by an older version"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_VERSION:
+            self.conn.executescript(
+                "DROP TABLE IF EXISTS postings;"
+                "DROP TABLE IF EXISTS docs;"
+            )
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "  id INTEGER PRIMARY KEY,"
+            "  path TEXT UNIQUE NOT NULL,"
+            "  mtime_ns INTEGER NOT NULL,"
+            "  size INTEGER NOT NULL,"
+            "  length INTEGER NOT NULL"
+            ");"
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "  term TEXT NOT NULL,"
+            "  doc_id INTEGER NOT NULL,"
+            "  tf INTEGER NOT NULL,"
+            "  PRIMARY KEY (term, doc_id)"
+            ") WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);"
+            f"PRAGMA user_version = {INDEX_VERSION};"
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self.conn.close()
+
+    def _document_terms(self, relative_path: Path, file_path: Path) -> Counter:
+        """Collect weighted term frequencies for one file"""
+        terms = Counter()
+        for term in tokenize(' '.join(relative_path.parts)):
+            terms[term] += PATH_WEIGHT
+
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read(MAX_INDEX_BYTES)
+        except OSError:
+            return terms
+
+        # Binary files are indexed by path only
+        if '\x00' not in content[:1024]:
+            terms.update(tokenize(content))
+        return terms
+
+    def update(self, files: Iterable[Tuple[str, os.stat_result]]) -> Dict:
+        """Bring the index in sync with the given files, re-reading only changed ones
+
+        ``files`` are (relative POSIX path, stat result) pairs, as yielded by
+        ``BaseExporter.iter_file_stats``, so unchanged files cost no second ``stat()``.
+        They are compared by size and modification time against the stored metadata;
+        files no longer present in ``files`` are removed from the index.
+        """
+        known = {
+            path: (mtime_ns, size, doc_id)
+            for doc_id, path, mtime_ns, size in self.conn.execute(
+                "SELECT id, path, mtime_ns, size FROM docs"
+            )
+        }
+        seen = set()
+        added = 0
+        updated = 0
+
+        with self.conn:
+            for key, stat in files:
+                seen.add(key)
+
+                entry = known.get(key)
+                if entry is not None:
+                    mtime_ns, size, doc_id = entry
+                    if mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+                        continue
+                    self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                    self.conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+                    updated += 1
+                else:
+                    added += 1
+
+                relative_path = Path(key)
+                terms = self._document_terms(relative_path, self.source_dir / relative_path)
+                cursor = self.conn.execute(
+                    "INSERT INTO docs (path, mtime_ns, size, length) VALUES (?, ?, ?, ?)",
+                    (key, stat.st_mtime_ns, stat.st_size, sum(terms.values()))
+                )
+                doc_id = cursor.lastrowid
+                self.conn.executemany(
+                    "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                    ((term, doc_id, tf) for term, tf in terms.items())
+                )
+
+            removed = [entry[2] for path, entry in known.items() if path not in seen]
+            for doc_id in removed:
+                self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                self.conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+        return {
+            'indexed': len(seen),
+            'added': added,
+            'updated': updated,
+            'removed': len(removed),
+        }
+
+    def search(self, query: str, top_k: int = 20,
+               candidates: Optional[Iterable[Path]] = None) -> List[Tuple[Path, float]]:
+        """Rank indexed files against the query with BM25, best match first
+
+        If ``candidates`` is given, only those paths (relative to the source) are ranked.
+        """
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return []
+
+        total_docs, avg_length = self.conn.execute(
+            "SELECT COUNT(*), AVG(length) FROM docs"
+        ).fetchone()
+        if not total_docs:
+            return []
+        avg_length = avg_length or 1.0
+
+        # Per-term IDF is computed here; summing BM25 over postings, ranking and the path
+        # lookup run inside SQLite, so no per-posting Python work is needed
+        weighted_terms = []
+        for term in sorted(query_terms):
+            doc_freq = self.conn.execute(
+                "SELECT COUNT(*) FROM postings WHERE term = ?", (term,)
+            ).fetchone()[0]
+            if doc_freq:
+                idf = math.log(1 + (total_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+                weighted_terms.append((term, idf))
+        if not weighted_terms:
+            return []
+
+        values = ', '.join('(?, ?)' for _ in weighted_terms)
+        sql = (
+            f"WITH query (term, idf) AS (VALUES {values}) "
+            "SELECT d.path, SUM(q.idf * p.tf * ? / (p.tf + ? * (1 - ? + ? * d.length / ?))) AS score "
+            "FROM query q JOIN postings p ON p.term = q.term JOIN docs d ON d.id = p.doc_id "
+            "GROUP BY p.doc_id ORDER BY score DESC, p.doc_id"
+        )
+        params = [value for pair in weighted_terms for value in pair]
+        params += [BM25_K1 + 1, BM25_K1, BM25_B, BM25_B, avg_length]
+
+        if candidates is None:
+            rows = self.conn.execute(sql + " LIMIT ?", params + [top_k])
+            return [(Path(path), score) for path, score in rows]
+
+        allowed = {Path(path).as_posix() for path in candidates}
+        results = []
+        for path, score in self.conn.execute(sql, params):
+            if path in allowed:
+                results.append((Path(path), score))
+                if len(results) == top_k:
+                    break
+        return results
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Sources - Input backends that stream files from archives and git commits
+"""
+
+import subprocess
+import tarfile
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterator, Optional
+
+from .changes import run_git
+
+# Suffixes recognised as archives, longest first so '.tar.gz' wins over '.gz'
+ARCHIVE_SUFFIXES = ('.tar.gz', '.tar.bz2', '.tar.xz', '.tgz', '.tbz2', '.txz', '.tar', '.zip')
+
+
+class SourceEntry:
+    """A regular file offered by an input source
+
+    ``read()`` must be called before the source moves on to the next entry: streamed
+    archives cannot go back.
+    """
+
+    def __init__(self, relative_path: Path, size: int, mtime_ns: int,
+                 reader: Callable[[Optional[int]], bytes]):
+        self.relative_path = relative_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._reader = reader
+
+    def read(self, size: Optional[int] = None) -> bytes:
+        """Return the file's bytes, or only its first ``size`` bytes"""
+        return self._reader(size)
+
+
+class InputSource:
+    """Base class for input backends other than a directory on disk
+
+    Sources yield entries in their own order (archive member order, or tree order for
+    git commits). Entries rejected by ``should_skip`` are never read.
+    """
+
+    def __init__(self, location: Path):
+        self.location = Path(location)
+
+    @property
+    def label(self) -> str:
+        """Human-readable description of the source, used in export headers"""
+        return str(self.location)
+
+    @property
+    def name(self) -> str:
+        """Project name used for default output filenames"""
+        return self.location.name
+
+    def iter_entries(self, should_skip: Callable[[Path], bool]) -> Iterator[SourceEntry]:
+        """Yield the files of the source that ``should_skip`` does not reject"""
+        raise NotImplementedError
+
+
+def _member_path(name: str) -> Optional[Path]:
+    """Relative path of an archive member, or None if nothing is left after normalising"""
+    parts = [part for part in PurePosixPath(name).parts if part not in ('/', '.', '..')]
+    return Path(*parts) if parts else None
+
+
+def _archive_stem(name: str) -> str:
+    """Archive file name without its archive suffix"""
+    lowered = name.lower()
+    for suffix in ARCHIVE_SUFFIXES:
+        if lowered.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+class TarSource(InputSource):
+    """Members of a (possibly compressed) tar archive, read as a single forward stream"""
+
+    @property
+    def name(self) -> str:
+        return _archive_stem(self.location.name)
+
+    def iter_entries(self, should_skip: Callable[[Path], bool]) -> Iterator[SourceEntry]:
+        # Stream mode never seeks, so compressed archives are decompressed exactly once
+        with tarfile.open(self.location, mode='r|*') as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue  # Directories, links and devices carry no content
+                relative_path = _member_path(member.name)
+                if relative_path is None or should_skip(relative_path):
+                    continue
+
+                def read(size=None, member=member) -> bytes:
+                    with archive.extractfile(member) as f:
+                        return f.read(-1 if size is None else size)
+
+                yield SourceEntry(relative_path, member.size, int(member.mtime) * 10**9, read)
+
+
+class ZipSource(InputSource):
+    """Members of a zip archive, decompressed one at a time"""
+
+    @property
+    def name(self) -> str:
+        return _archive_stem(self.location.name)
+
+    def iter_entries(self, should_skip: Callable[[Path], bool]) -> Iterator[SourceEntry]:
+        with zipfile.ZipFile(self.location) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                relative_path = _member_path(info.filename)
+                if relative_path is None or should_skip(relative_path):
+                    continue
+
+                def read(size=None, info=info) -> bytes:
+                    if size is None:
+                        return archive.read(info)
+                    with archive.open(info) as f:
+                        return f.read(size)
+
+                # Zip timestamps are local wall-clock times without a zone
+                mtime = int(time.mktime(info.date_time + (0, 0, -1))) * 10**9
+                yield SourceEntry(relative_path, info.file_size, mtime, read)
+
+
+class GitCommitSource(InputSource):
+    """Files of a git commit, read from the object database without a checkout
+
+    ``location`` may be a subdirectory of the repository; only files below it are
+    exported, with paths relative to it, as for a directory export.
+    """
+
+    def __init__(self, location: Path, ref: str):
+        super().__init__(location)
+        self.ref = ref
+        try:
+            self.commit = run_git(self.location, ['rev-parse', '--verify', '--quiet',
+                                                  f"{ref}^{{commit}}"]).strip()
+        except ValueError:
+            raise ValueError(f"Unknown git ref: {ref}")
+        commit_time = run_git(self.location, ['show', '-s', '--format=%ct', self.commit])
+        self.commit_time_ns = int(commit_time) * 10**9
+
+    @property
+    def label(self) -> str:
+        return f"{self.location}@{self.ref} ({self.commit[:12]})"
+
+    def iter_entries(self, should_skip: Callable[[Path], bool]) -> Iterator[SourceEntry]:
+        listing = run_git(self.location, ['ls-tree', '-r', '-l', '-z', self.commit, '--', '.'])
+
+        # One long-lived cat-file process serves every blob, in listing order
+        process = subprocess.Popen(
+            ['git', 'cat-file', '--batch'], cwd=str(self.location),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+        def read_blob(oid: str) -> bytes:
+            process.stdin.write(f"{oid}\n".encode('ascii'))
+            process.stdin.flush()
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                raise ValueError(f"git cat-file could not read object {oid}")
+            data = process.stdout.read(int(header[2]))
+            process.stdout.read(1)  # Trailing newline
+            return data
+
+        try:
+            for record in listing.split('\0'):
+                if not record:
+                    continue
+                meta, _, path = record.partition('\t')
+                mode, object_type, oid, size = meta.split()
+                # Submodules are commits and symlinks are blobs holding the link target
+                if object_type != 'blob' or mode == '120000':
+                    continue
+                relative_path = Path(path)
+                if should_skip(relative_path):
+                    continue
+                # cat-file always sends the whole blob; a bounded read keeps its head
+                yield SourceEntry(relative_path, int(size), self.commit_time_ns,
+                                  lambda limit=None, oid=oid: read_blob(oid)[:limit])
+        finally:
+            process.stdin.close()
+            process.wait()
+            process.stdout.close()
+
+
+def open_source(path: Path, commit: Optional[str] = None) -> Optional[InputSource]:
+    """Input backend for a path, or None for a directory exported from disk
+
+    Archives are recognised by their suffix; ``commit`` exports a git commit of the
+    repository containing ``path`` instead of its working tree.
+    """
+    path = Path(path)
+    if commit is not None:
+        if not path.is_dir():
+            raise ValueError(f"--commit needs a directory inside a git repository: {path}")
+        return GitCommitSource(path, commit)
+    if path.is_dir():
+        return None
+
+    lowered = path.name.lower()
+    if lowered.endswith('.zip'):
+        return ZipSource(path)
+    if any(lowered.endswith(suffix) for suffix in ARCHIVE_SUFFIXES):
+        return TarSource(path)
+    raise ValueError(
+        f"Unsupported source file: {path} (expected a directory or one of {', '.join(ARCHIVE_SUFFIXES)})"
+    )
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tokens - Token counting for LLM context planning, with optional persistent caching
+"""
+
+from typing import Optional
+
+from .cache import TokenCache
+from .changes import hash_text
+
+DEFAULT_ENCODING = 'cl100k_base'  # GPT-4 encoding
+
+# Cache key used when tiktoken is unavailable and tokens are estimated from length
+APPROXIMATE_ENCODING = 'approx-4-chars'
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken, falling back to ~4 characters per token"""
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING, cache: Optional[TokenCache] = None):
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        try:
+            import tiktoken
+            self._encoding = tiktoken.get_encoding(encoding_name)
+            self.encoding_name = encoding_name
+        except ImportError:
+            self._encoding = None
+            self.encoding_name = APPROXIMATE_ENCODING
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether counts come from a real tokenizer rather than a length estimate"""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Count tokens in text without consulting the cache"""
+        if self._encoding is None:
+            return len(text) // 4
+        # File contents may legitimately contain special-token markup
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def count_cached(self, text: str, content_hash: Optional[str] = None) -> int:
+        """Count tokens, reusing a previous count for identical content"""
+        # The length estimate is cheaper than a cache lookup
+        if self.cache is None or self._encoding is None:
+            return self.count(text)
+
+        content_hash = content_hash or hash_text(text)
+        tokens = self.cache.get(content_hash, self.encoding_name)
+        if tokens is not None:
+            self.hits += 1
+            return tokens
+
+        self.misses += 1
+        tokens = self.count(text)
+        self.cache.put(content_hash, self.encoding_name, tokens)
+        return tokens
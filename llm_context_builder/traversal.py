@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Traversal - Serial and multi-threaded directory walking with folder pruning
+"""
+
+import os
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+# (sorted file names, sorted subdirectories that were descended into); when following
+# symlinks, subdirectories are (name, (st_dev, st_ino)) pairs
+DirListing = Tuple[List[str], List]
+
+
+class ParallelWalker:
+    """Walks a directory tree with a pool of threads sharing work by stealing
+
+    Each worker owns a deque of directories: it pushes subdirectories it discovers onto
+    its own deque and pops from the same end (depth-first, cache friendly), while idle
+    workers steal from the opposite end of other workers' deques. Directory listing
+    releases the GIL, so threads overlap the ``getdents``/``stat`` latency that dominates
+    on network filesystems.
+    """
+
+    def __init__(self, root: str, should_exclude_folder: Callable[[str], bool], workers: int,
+                 follow_symlinks: bool = False):
+        self.root = root
+        self.should_exclude_folder = should_exclude_folder
+        self.follow_symlinks = follow_symlinks
+        self.visited: Set[Tuple[int, int]] = set()
+        self.scanned: Dict[Tuple[int, int], str] = {}  # directory identity -> path it was scanned at
+        self.workers = max(1, workers)
+        self.deques: List[Deque[str]] = [deque() for _ in range(self.workers)]
+        self.cond = threading.Condition()
+        self.pending = 0  # directories queued or being scanned
+        self.listings: Dict[str, DirListing] = {}
+
+    def _push(self, index: int, path: str) -> None:
+        """Queue a directory on a worker's own deque"""
+        with self.cond:
+            self.pending += 1
+            self.deques[index].append(path)
+            self.cond.notify()
+
+    def _steal(self, index: int) -> Optional[str]:
+        """Take the oldest queued directory from another worker"""
+        for offset in range(1, self.workers):
+            victim = self.deques[(index + offset) % self.workers]
+            try:
+                return victim.popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _first_visit(self, key: Tuple[int, int]) -> bool:
+        """Record a directory identity; False if another path already claimed it"""
+        with self.cond:
+            if key in self.visited:
+                return False
+            self.visited.add(key)
+            return True
+
+    def _scan(self, index: int, path: str) -> None:
+        """List one directory, queueing the subdirectories that survive pruning"""
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if not is_dir:
+                        files.append(entry.name)
+                    elif self.should_exclude_folder(entry.name):
+                        continue
+                    elif self.follow_symlinks:
+                        try:
+                            key = _inode_key(entry.path)
+                        except OSError:
+                            continue
+                        # Every alias is recorded so the merge can pick winners in walk order,
+                        # but each physical directory is only scanned once
+                        subdirs.append((entry.name, key))
+                        if self._first_visit(key):
+                            self.scanned[key] = entry.path
+                            self._push(index, entry.path)
+                    elif not entry.is_symlink():
+                        # Like os.walk, directory symlinks are not followed by default
+                        subdirs.append(entry.name)
+                        self._push(index, entry.path)
+        except OSError:
+            pass
+
+        files.sort()
+        subdirs.sort()
+        self.listings[path] = (files, subdirs)
+
+    def _work(self, index: int) -> None:
+        """Worker loop: drain own deque, steal when empty, exit when the tree is done"""
+        own = self.deques[index]
+        while True:
+            try:
+                path = own.pop()
+            except IndexError:
+                path = self._steal(index)
+
+            if path is None:
+                with self.cond:
+                    if self.pending == 0:
+                        self.cond.notify_all()
+                        return
+                    # Work pushed after our steal attempt is visible here, as pushes hold the lock
+                    if not any(self.deques):
+                        self.cond.wait()
+                continue
+
+            try:
+                self._scan(index, path)
+            finally:
+                with self.cond:
+                    self.pending -= 1
+                    if self.pending == 0:
+                        self.cond.notify_all()
+
+    def _scan_tree(self) -> Optional[Tuple[int, int]]:
+        """List every directory on the workers; returns the root's identity when following symlinks"""
+        root_key = None
+        if self.follow_symlinks:
+            root_key = _inode_key(self.root)
+            self._first_visit(root_key)
+            self.scanned[root_key] = self.root
+        self._push(0, self.root)
+        threads = [
+            threading.Thread(target=self._work, args=(index,), daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return root_key
+
+    def walk(self) -> Iterator[Tuple[str, List[str]]]:
+        """Scan the whole tree, then yield (dirpath, files) in sorted top-down order"""
+        root_key = self._scan_tree()
+        if self.follow_symlinks:
+            yield from self._merge_by_identity(root_key)
+            return
+
+        stack = [self.root]
+        while stack:
+            path = stack.pop()
+            files, subdirs = self.listings.get(path, ([], []))
+            yield path, files
+            stack.extend(os.path.join(path, name) for name in reversed(subdirs))
+
+    def _merge_by_identity(self, root_key: Tuple[int, int]) -> Iterator[Tuple[str, List[str]]]:
+        """Replay listings in walk order, giving each directory to the first path that reaches it
+
+        Claims are made when a parent lists its children, exactly as the serial walk does,
+        so the result does not depend on which thread happened to scan a directory first.
+        """
+        claimed = {root_key}
+        stack = [(self.root, root_key)]
+        while stack:
+            path, key = stack.pop()
+            files, subdirs = self.listings.get(self.scanned.get(key, ''), ([], []))
+            yield path, files
+
+            children = []
+            for name, child_key in subdirs:
+                if child_key not in claimed:
+                    claimed.add(child_key)
+                    children.append((os.path.join(path, name), child_key))
+            stack.extend(reversed(children))
+
+    def walk_claimants(self, folder_filters: List[Callable[[str], bool]]
+                       ) -> Iterator[Tuple[str, List[str], List[int]]]:
+        """Scan the whole tree, then yield (dirpath, files, indexes of the filters reaching it)
+
+        Like ``_merge_by_identity``, but each folder filter claims directories for itself,
+        so a directory one filter rejects at its first path can still be claimed by
+        another filter at a later path. Needs ``follow_symlinks``.
+        """
+        root_key = self._scan_tree()
+        claimed = [{root_key} for _ in folder_filters]
+        stack = [(self.root, root_key, list(range(len(folder_filters))))]
+        while stack:
+            path, key, owners = stack.pop()
+            files, subdirs = self.listings.get(self.scanned.get(key, ''), ([], []))
+            yield path, files, owners
+
+            children = []
+            for name, child_key in subdirs:
+                child_owners = [
+                    index for index in owners
+                    if child_key not in claimed[index] and not folder_filters[index](name)
+                ]
+                for index in child_owners:
+                    claimed[index].add(child_key)
+                if child_owners:
+                    children.append((os.path.join(path, name), child_key, child_owners))
+            stack.extend(reversed(children))
+
+
+def _inode_key(path: str) -> Tuple[int, int]:
+    """Identity of the file or directory a path resolves to"""
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino
+
+
+def walk_tree(root: str, should_exclude_folder: Callable[[str], bool],
+              workers: int = 1, follow_symlinks: bool = False) -> Iterator[Tuple[str, List[str]]]:
+    """Yield (dirpath, sorted file names) top-down, pruning excluded folders
+
+    The order is the same for any number of workers: files of a directory come before
+    its subdirectories, and siblings are visited in sorted order. With
+    ``follow_symlinks``, directory symlinks are descended into, and each physical
+    directory is visited once (by device and inode), so symlink cycles terminate.
+    """
+    if workers > 1:
+        yield from ParallelWalker(root, should_exclude_folder, workers, follow_symlinks).walk()
+        return
+
+    visited: Set[Tuple[int, int]] = set()
+    if follow_symlinks:
+        visited.add(_inode_key(root))
+
+    for dirpath, dirs, files in os.walk(root, followlinks=follow_symlinks):
+        kept = []
+        for d in sorted(dirs):
+            if should_exclude_folder(d):
+                continue
+            if follow_symlinks:
+                try:
+                    key = _inode_key(os.path.join(dirpath, d))
+                except OSError:
+                    continue
+                if key in visited:
+                    continue
+                visited.add(key)
+            kept.append(d)
+        dirs[:] = kept
+        yield dirpath, sorted(files)
+
+
+def walk_tree_claimants(root: str, folder_filters: List[Callable[[str], bool]],
+                        workers: int = 1) -> Iterator[Tuple[str, List[str], List[int]]]:
+    """Follow symlinks for several folder filters in one walk
+
+    Yields (dirpath, sorted file names, indexes of the filters that reach dirpath).
+    Each physical directory is listed once, but each filter gets the directories a
+    separate ``walk_tree(root, filter, follow_symlinks=True)`` would visit, at the same
+    paths. A folder is pruned from the listing only when every filter excludes it.
+    """
+    def excluded_by_all(name: str) -> bool:
+        return all(folder_filter(name) for folder_filter in folder_filters)
+
+    walker = ParallelWalker(root, excluded_by_all, workers, follow_symlinks=True)
+    yield from walker.walk_claimants(folder_filters)